@@ -0,0 +1,653 @@
+#!/usr/bin/env python3
+"""
+Benchmarks for scripts/market_scan.py.
+
+Runs entirely on synthetic data (or a recorded fixture archive), so no network
+access or google_play_scraper install is needed. The ``pipeline`` benchmark
+times each stage at a grid of scales, each in a fresh interpreter so peak RSS
+is per scale point, and can write the results as JSON and flag regressions
+against an earlier results file.
+
+Usage:
+- python3 scripts/bench_market_scan.py signals --reviews 100000
+- python3 scripts/bench_market_scan.py select --rows 1000,10000,100000
+- python3 scripts/bench_market_scan.py check-select --trials 5000
+- python3 scripts/bench_market_scan.py pipeline --apps 20,200,5000 --reviews 100,1000,100000 --out bench.json
+- python3 scripts/bench_market_scan.py pipeline --fixtures recorded.jsonl.gz --out bench.json
+- python3 scripts/bench_market_scan.py compare baseline.json bench.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import platform
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import zlib
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import market_scan  # noqa: E402
+
+
+FILLER_ALPHABET = "abcdefghiklmnoprstuvwy"
+
+
+def synthetic_reviews(count: int, seed: int = 7, keyword_rate: float = 0.04) -> list[dict[str, Any]]:
+    """Review dicts shaped like gp_reviews output, with a realistic keyword density."""
+    rng = random.Random(seed)
+    keywords = [k for words in market_scan.SIGNALS.values() for k in words]
+    filler = ["".join(rng.choice(FILLER_ALPHABET) for _ in range(rng.randint(2, 9))) for _ in range(4000)]
+    spacers = [" ", " ", " ", "  ", "\n", "\t "]
+    out: list[dict[str, Any]] = []
+    for i in range(count):
+        words: list[str] = []
+        for _ in range(rng.randint(4, 70)):
+            word = rng.choice(keywords) if rng.random() < keyword_rate else rng.choice(filler)
+            if rng.random() < 0.05:
+                word = word.upper()
+            words.append(word)
+            words.append(rng.choice(spacers))
+        out.append({"reviewId": f"r{i}", "content": "".join(words), "score": rng.randint(1, 5)})
+    return out
+
+
+def reference_signal_counts(review_items: list[dict[str, Any]]) -> dict[str, int]:
+    """The original per-keyword scan, kept as the correctness oracle."""
+    counts = {k: 0 for k in market_scan.SIGNALS}
+    for row in review_items:
+        text = market_scan.re.sub(r"\s+", " ", str(row.get("content", "")).strip().lower())
+        for signal, keywords in market_scan.SIGNALS.items():
+            if any(keyword in text for keyword in keywords):
+                counts[signal] += 1
+    return counts
+
+
+def best_of(repeat: int, fn: Any, *args: Any) -> tuple[float, Any]:
+    best = float("inf")
+    result = None
+    for _ in range(max(1, repeat)):
+        started = time.perf_counter()
+        result = fn(*args)
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def bench_signals(args: argparse.Namespace) -> int:
+    items = synthetic_reviews(args.reviews, seed=args.seed)
+    texts = [market_scan.normalize_text(str(r["content"])) for r in items]
+
+    ref_s, ref_counts = best_of(args.repeat, reference_signal_counts, items)
+    new_s, new_counts = best_of(args.repeat, lambda: market_scan.SIGNAL_MATCHER.count(
+        [market_scan.normalize_text(str(r["content"])) for r in items]
+    ))
+    scan_s, _ = best_of(args.repeat, market_scan.SIGNAL_MATCHER.scan, texts)
+
+    print(f"reviews: {len(items)}")
+    print(f"reference scan      : {ref_s:8.3f}s  {len(items) / ref_s:12,.0f} reviews/s")
+    print(f"compiled matcher    : {new_s:8.3f}s  {len(items) / new_s:12,.0f} reviews/s  ({ref_s / new_s:.2f}x)")
+    print(f"  matcher scan only : {scan_s:8.3f}s  {len(items) / scan_s:12,.0f} reviews/s")
+    if new_counts != ref_counts:
+        print(f"MISMATCH: reference={ref_counts} compiled={new_counts}")
+        return 1
+    print("counts identical to reference")
+    return 0
+
+
+def reference_select_apps(
+    rows: list[dict[str, Any]],
+    max_apps: int,
+    min_installs: int,
+    category_caps: dict[str, int] | None = None,
+) -> list[dict[str, Any]]:
+    """The original sort-then-scan ``select_apps``, kept as the correctness oracle."""
+    target_by_category = dict(category_caps or market_scan.DEFAULT_CATEGORY_CAPS)
+    ok = [
+        r
+        for r in rows
+        if r.get("status") == "ok"
+        and int(r.get("installs_count") or 0) >= min_installs
+        and int(r.get("relevance") or 0) >= 2
+        and market_scan.is_relevant_row(r)
+        and r.get("category") in target_by_category
+    ]
+    ok.sort(
+        key=lambda r: (int(r.get("installs_count") or 0), float(r.get("score") or 0.0), int(r.get("ratings") or 0)),
+        reverse=True,
+    )
+
+    selected: list[dict[str, Any]] = []
+    used: set[str] = set()
+    selected_by_cat: dict[str, int] = {}
+    for cat, needed in target_by_category.items():
+        picks = [r for r in ok if r.get("category") == cat and r.get("package_name") not in used][:needed]
+        for p in picks:
+            used.add(str(p.get("package_name")))
+            selected.append(p)
+            selected_by_cat[cat] = selected_by_cat.get(cat, 0) + 1
+
+    for r in ok:
+        pkg = str(r.get("package_name"))
+        if pkg in used:
+            continue
+        cat = str(r.get("category"))
+        cap = target_by_category.get(cat, 3)
+        if selected_by_cat.get(cat, 0) >= cap:
+            continue
+        selected.append(r)
+        used.add(pkg)
+        selected_by_cat[cat] = selected_by_cat.get(cat, 0) + 1
+        if len(selected) >= max_apps:
+            break
+
+    return selected[:max_apps]
+
+
+def synthetic_selection_rows(count: int, seed: int = 7, packages: int = 0) -> list[dict[str, Any]]:
+    """Metadata rows as ``select_apps`` sees them, with many ties.
+
+    ``packages`` > 0 draws package names from that many ids, so the same
+    package shows up in several rows and categories, as in multi-market input.
+    """
+    rng = random.Random(seed)
+    metas = [
+        {"title": title, "summary": summary, "description": description}
+        for title in ["Porn Blocker", "Gambling blocker casino", "Focus block productivity", "Safe browser privacy", "Notes"]
+        for summary in ["quit porn addiction recovery", "block distractions", "casino sportsbook bet"]
+        for description in ["", "vpn", "self control block"]
+    ]
+    hits = [market_scan.build_text_hits(meta) for meta in metas]
+    categories = list(market_scan.CATEGORY_PRIORITY)
+    rows: list[dict[str, Any]] = []
+    for i in range(count):
+        rows.append(
+            {
+                "package_name": f"com.synth.app{rng.randrange(packages) if packages else i}",
+                "status": "ok" if rng.random() < 0.95 else "error",
+                "category": rng.choice(categories),
+                "relevance": rng.randint(0, 5),
+                "installs_count": rng.choice([0, 1000, 10_000, 100_000, 1_000_000, 10_000_000]),
+                "score": rng.choice([None, 3.5, 4.0, 4.2, 4.5]),
+                "ratings": rng.randint(0, 20),
+                "text_hits": rng.choice(hits),
+            }
+        )
+    return rows
+
+
+def check_select_equivalence(trials: int, seed: int = 7) -> str | None:
+    """Compare ``select_apps`` with the reference on randomized inputs.
+
+    Inputs are small and duplicate-heavy, with default, partial and zero
+    category caps. Every fifth trial gives all rows the same sort key, so
+    the order among ties decides the result. Returns a description of the
+    first mismatch, or None.
+    """
+    rng = random.Random(seed)
+    for trial in range(trials):
+        rows = synthetic_selection_rows(rng.randint(0, 400), seed=trial, packages=rng.choice([0, 20, 80]))
+        if trial % 5 == 0:
+            for row in rows:
+                row.update(installs_count=1_000_000, score=4.0, ratings=7)
+        caps = None
+        if trial % 3:
+            caps = {cat: rng.randint(0, 8) for cat in rng.sample(list(market_scan.DEFAULT_CATEGORY_CAPS), rng.randint(1, 4))}
+        max_apps, min_installs = rng.randint(0, 30), rng.choice([0, 10_000, 1_000_000])
+        expected = reference_select_apps(rows, max_apps, min_installs, caps)
+        got = market_scan.select_apps(rows, max_apps, min_installs, caps)
+        if [id(r) for r in got] != [id(r) for r in expected]:
+            return f"trial {trial}: caps={caps} max_apps={max_apps} min_installs={min_installs}"
+    return None
+
+
+def bench_check_select(args: argparse.Namespace) -> int:
+    mismatch = check_select_equivalence(args.trials, args.seed)
+    if mismatch:
+        print(f"MISMATCH in {mismatch}")
+        return 1
+    print(f"selection identical to reference in {args.trials} randomized trials")
+    return 0
+
+
+def bench_select(args: argparse.Namespace) -> int:
+    if bench_check_select(args):
+        return 1
+
+    for count in parse_int_list(args.rows):
+        rows = synthetic_selection_rows(count, seed=args.seed, packages=count // 3)
+        ref_s, expected = best_of(args.repeat, reference_select_apps, rows, 22, 10_000)
+        new_s, got = best_of(args.repeat, market_scan.select_apps, rows, 22, 10_000)
+        same = "identical" if [id(r) for r in got] == [id(r) for r in expected] else "MISMATCH"
+        print(
+            f"rows={count:>9,}  reference {ref_s * 1000:9.2f} ms  bucketed {new_s * 1000:9.2f} ms  "
+            f"({ref_s / new_s:.2f}x, {same})"
+        )
+        if same != "identical":
+            return 1
+    return 0
+
+
+SYNTH_CATEGORY_TITLES = [
+    "Porn Blocker",
+    "Gambling blocker casino",
+    "Focus block productivity",
+    "Safe browser privacy",
+    "Notes",
+]
+SYNTH_INSTALLS = ["5,000+", "10,000+", "100,000+", "1,000,000+", "50,000,000+"]
+
+
+class SyntheticPlay:
+    """Deterministic stand-in for Google Play, sized to a benchmark scale point.
+
+    It has the same ``serve(call, key_parts)`` interface as
+    ``market_scan.ReplayBackend``, so it plugs into ``PlayClient(replay=...)``.
+    Each discovery query returns a disjoint stride of the ``apps`` synthetic
+    packages, so discovery finds all of them. Every app has ``reviews_per_app``
+    newest-first reviews. Texts come from pre-generated pools, which keeps
+    generation cost out of the stage timings.
+    """
+
+    def __init__(self, apps: int, reviews_per_app: int, seed: int = 7) -> None:
+        self.apps = apps
+        self.reviews_per_app = reviews_per_app
+        queries = [q for qs in market_scan.SEARCH_SEGMENTS.values() for q in qs]
+        self.query_index = {market_scan.normalize_text(q): i for i, q in enumerate(queries)}
+        self.query_count = len(queries)
+        rng = random.Random(seed)
+        vocab = [k for words in market_scan.CATEGORY_KEYWORDS.values() for k in words] + FILLER_ALPHABET.split("a")
+        self.descriptions = [" ".join(rng.choice(vocab) for _ in range(rng.randint(80, 400))) for _ in range(200)]
+        self.review_pool = synthetic_reviews(min(20_000, max(1_000, reviews_per_app)), seed=seed)
+        self.base_time = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+    @property
+    def hits_per_query(self) -> int:
+        return max(1, math.ceil(self.apps / self.query_count))
+
+    def serve(self, call: str, key_parts: list[Any]) -> Any:
+        if call == "search":
+            query, _lang, _country, n_hits = key_parts
+            start = self.query_index.get(query, 0)
+            return [
+                {"appId": f"com.synth.app{j}", "title": f"App {j}", "installs": SYNTH_INSTALLS[j % len(SYNTH_INSTALLS)]}
+                for j in range(start, self.apps, self.query_count)
+            ][:n_hits]
+        if call == "app":
+            app_id = key_parts[0]
+            n = zlib.crc32(app_id.encode("utf-8"))
+            return {
+                "title": f"{SYNTH_CATEGORY_TITLES[n % len(SYNTH_CATEGORY_TITLES)]} {app_id}",
+                "developer": "Synthetic",
+                "installs": SYNTH_INSTALLS[n % len(SYNTH_INSTALLS)],
+                "score": round(2.0 + (n % 300) / 100.0, 2),
+                "ratings": n % 1_000_000,
+                "reviews": self.reviews_per_app,
+                "genre": "Tools",
+                "summary": "block distractions and stay focused",
+                # A fresh string per call, like a decoded Play response.
+                "description": f"{self.descriptions[n % len(self.descriptions)]} {app_id}",
+            }
+        if call == "reviews":
+            app_id, _lang, _country, count, token = key_parts
+            start = int(token or 0)
+            end = min(start + count, self.reviews_per_app)
+            offset = zlib.crc32(app_id.encode("utf-8"))
+            pool = self.review_pool
+            batch = []
+            for i in range(start, end):
+                src = pool[(offset + i) % len(pool)]
+                batch.append(
+                    {
+                        "reviewId": f"{app_id}-{i}",
+                        "userName": f"user{i}",
+                        "content": src["content"],
+                        "score": src["score"],
+                        "at": self.base_time - timedelta(minutes=i),
+                    }
+                )
+            return {"batch": batch, "token": {"token": str(end) if end < self.reviews_per_app else None}}
+        raise LookupError(f"unknown call {call}")
+
+
+def peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and kilobytes elsewhere.
+    return round(peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024, 1)
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Nearest-rank percentile; 0.0 for no values."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(pct / 100.0 * len(ordered)) - 1)]
+
+
+def stage_result(wall_s: float, items: int, latencies_s: list[float]) -> dict[str, Any]:
+    latencies_s = latencies_s or [wall_s]
+    return {
+        "wall_s": round(wall_s, 6),
+        "items": items,
+        "throughput_per_s": round(items / wall_s, 1) if wall_s > 0 else 0.0,
+        "p50_ms": round(percentile(latencies_s, 50) * 1000.0, 3),
+        "p95_ms": round(percentile(latencies_s, 95) * 1000.0, 3),
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def call_latencies(profiler: market_scan.PipelineProfiler, call_type: str) -> list[float]:
+    return [e["dur"] / 1e6 for e in profiler.events if e["cat"] == "call" and e["name"] == call_type]
+
+
+def run_scale_point(apps: int, reviews_per_app: int, seed: int, workers: int, fixtures: str = "") -> dict[str, Any]:
+    """Time every pipeline stage once at one scale point (or over a fixture archive)."""
+    lang, country = "en", "us"
+    review_targets: dict[str, int] = {}
+    if fixtures:
+        backend: Any = market_scan.ReplayBackend(market_scan.PlayFixtures(Path(fixtures)))
+        searches = [e["args"] for e in backend.fixtures.entries.values() if e["call"] == "search"]
+        if not searches:
+            raise SystemExit(f"{fixtures} has no recorded searches")
+        _query, lang, country, hits_per_query = searches[0]
+        # Replay only the review pages that were recorded: the first page's size
+        # is the per-app review target of the recorded run (capped at a page).
+        review_targets = {
+            e["args"][0]: e["args"][3]
+            for e in backend.fixtures.entries.values()
+            if e["call"] == "reviews" and e["args"][4] is None
+        }
+    else:
+        backend = SyntheticPlay(apps, reviews_per_app, seed=seed)
+        hits_per_query = backend.hits_per_query
+    profiler = market_scan.PipelineProfiler()
+    client = market_scan.PlayClient(profiler=profiler, replay=backend, max_retries=0)
+    stages: dict[str, dict[str, Any]] = {}
+    baseline_rss = peak_rss_mb()
+
+    started = time.perf_counter()
+    candidates = market_scan.discover_candidates(lang, country, hits_per_query=hits_per_query, client=client, workers=workers)
+    stages["discovery"] = stage_result(
+        time.perf_counter() - started, len(call_latencies(profiler, "search")), call_latencies(profiler, "search")
+    )
+
+    started = time.perf_counter()
+    meta_rows = market_scan.fetch_metadata_for_candidates(candidates, lang, country, workers=workers, client=client)
+    stages["metadata"] = stage_result(time.perf_counter() - started, len(meta_rows), call_latencies(profiler, "app"))
+
+    started = time.perf_counter()
+    selected = market_scan.select_apps(meta_rows, max_apps=len(meta_rows), min_installs=0)
+    stages["select_apps"] = stage_result(time.perf_counter() - started, len(meta_rows), [])
+
+    # select_apps caps the selection per category, so the review stages run
+    # over every app that fetched cleanly to reach the requested scale.
+    rows = [r.to_json() for r in meta_rows if r.status == "ok"]
+    if fixtures:
+        rows = [r for r in rows if r["package_name"] in review_targets]
+    else:
+        rows = rows[:apps]
+    collect_s: list[float] = []
+    analyze_s: list[float] = []
+    total_reviews = 0
+    for row in rows:
+        started = time.perf_counter()
+        target = review_targets.get(str(row["package_name"]), reviews_per_app)
+        items = market_scan.collect_reviews(str(row["package_name"]), lang, country, target, client=client)
+        collected = time.perf_counter()
+        row["review_signals"] = market_scan.analyze_review_signals(items)
+        row["review_sample_size"] = len(items)
+        collect_s.append(collected - started)
+        analyze_s.append(time.perf_counter() - collected)
+        total_reviews += len(items)
+        del items
+    stages["review_collection"] = stage_result(sum(collect_s), total_reviews, collect_s)
+    stages["review_collection"]["peak_rss_mb"] = peak_rss_mb()
+    stages["analyze_review_signals"] = stage_result(sum(analyze_s), total_reviews, analyze_s)
+
+    started = time.perf_counter()
+    rollups = market_scan.category_rollup(rows)
+    stages["category_rollup"] = stage_result(time.perf_counter() - started, len(rows), [])
+
+    started = time.perf_counter()
+    with tempfile.TemporaryDirectory() as tmp:
+        payload = {
+            "generated_at": market_scan.now_iso(),
+            "country": country,
+            "lang": lang,
+            "reviews_per_app": reviews_per_app,
+            "hits_per_query": hits_per_query,
+            "max_apps": len(rows),
+            "review_window": None,
+            "sources": [],
+            "discovery_queries": [],
+            "play_error": "",
+            "selected_apps": rows,
+            "category_rollups": rollups,
+            "uiux_tasks": market_scan.build_priority_tasks(rows, rollups),
+            "history": None,
+        }
+        market_scan.write_market_markdown(Path(tmp), payload)
+        market_scan.write_json(Path(tmp) / "market_scan_latest.json", payload)
+    stages["emission"] = stage_result(time.perf_counter() - started, len(rows), [])
+
+    return {
+        "apps": len(rows),
+        "reviews_per_app": max(review_targets.values(), default=reviews_per_app),
+        "candidates": len(candidates),
+        "selected": len(selected),
+        "workers": workers,
+        "source": fixtures or "synthetic",
+        "start_rss_mb": baseline_rss,
+        "stages": stages,
+    }
+
+
+def compare_results(baseline: dict[str, Any], current: dict[str, Any], threshold: float, min_wall_s: float) -> list[str]:
+    """Regressions of ``current`` against ``baseline``, matched by scale point and stage.
+
+    Throughput falling, or p95 latency or peak RSS rising, by more than
+    ``threshold`` is a regression. Timing checks skip stages whose baseline
+    took under ``min_wall_s``, where noise dominates.
+    """
+    base_points = {(r["apps"], r["reviews_per_app"]): r for r in baseline["results"]}
+    problems: list[str] = []
+    for point in current["results"]:
+        base = base_points.get((point["apps"], point["reviews_per_app"]))
+        if base is None:
+            continue
+        label = f"apps={point['apps']} reviews={point['reviews_per_app']}"
+        for stage, cur in point["stages"].items():
+            old = base["stages"].get(stage)
+            if old is None:
+                continue
+            if old["wall_s"] >= min_wall_s:
+                if cur["throughput_per_s"] < old["throughput_per_s"] * (1.0 - threshold):
+                    problems.append(
+                        f"{label} {stage}: throughput {old['throughput_per_s']:,.0f} -> {cur['throughput_per_s']:,.0f}/s"
+                    )
+                if cur["p95_ms"] > old["p95_ms"] * (1.0 + threshold):
+                    problems.append(f"{label} {stage}: p95 {old['p95_ms']:.2f} -> {cur['p95_ms']:.2f} ms")
+            if cur["peak_rss_mb"] > old["peak_rss_mb"] * (1.0 + threshold):
+                problems.append(f"{label} {stage}: peak RSS {old['peak_rss_mb']} -> {cur['peak_rss_mb']} MB")
+    return problems
+
+
+def format_results(results: list[dict[str, Any]]) -> str:
+    lines: list[str] = []
+    for point in results:
+        lines.append(
+            f"apps={point['apps']} reviews/app={point['reviews_per_app']} "
+            f"(candidates={point['candidates']}, selected={point['selected']}, source={point['source']})"
+        )
+        lines.append(f"  {'stage':<24} {'wall s':>9} {'items':>10} {'items/s':>12} {'p50 ms':>9} {'p95 ms':>9} {'RSS MB':>8}")
+        for name, st in point["stages"].items():
+            lines.append(
+                f"  {name:<24} {st['wall_s']:>9.3f} {st['items']:>10} {st['throughput_per_s']:>12,.0f} "
+                f"{st['p50_ms']:>9.2f} {st['p95_ms']:>9.2f} {st['peak_rss_mb']:>8.1f}"
+            )
+    return "\n".join(lines)
+
+
+def parse_int_list(value: str) -> list[int]:
+    return [int(v) for v in value.split(",") if v.strip()]
+
+
+def bench_run_one(args: argparse.Namespace) -> int:
+    result = run_scale_point(args.apps, args.reviews, args.seed, args.workers, args.fixtures)
+    print(json.dumps(result))
+    return 0
+
+
+def bench_pipeline(args: argparse.Namespace) -> int:
+    # A fixture archive fixes both the app set and the review depth.
+    points = [(0, 0)] if args.fixtures else [
+        (apps, reviews)
+        for apps in parse_int_list(args.apps)
+        for reviews in parse_int_list(args.reviews)
+        if apps * reviews <= args.max_total_reviews
+    ]
+    results: list[dict[str, Any]] = []
+    for apps, reviews in points:
+        # A fresh interpreter per scale point keeps peak RSS readings separate.
+        cmd = [
+            sys.executable,
+            str(Path(__file__).resolve()),
+            "run-one",
+            "--apps",
+            str(apps),
+            "--reviews",
+            str(reviews),
+            "--seed",
+            str(args.seed),
+            "--workers",
+            str(args.workers),
+        ]
+        if args.fixtures:
+            cmd += ["--fixtures", args.fixtures]
+        done = subprocess.run(cmd, check=True, stdout=subprocess.PIPE, text=True)
+        results.append(json.loads(done.stdout.strip().splitlines()[-1]))
+        print(format_results(results[-1:]), flush=True)
+
+    report = {
+        "generated_at": datetime.now(timezone.utc).replace(microsecond=0).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "seed": args.seed,
+        "results": results,
+    }
+    if args.out:
+        Path(args.out).write_text(json.dumps(report, indent=2), encoding="utf-8")
+        print(f"Wrote: {args.out}")
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+        return report_regressions(compare_results(baseline, report, args.threshold, args.min_wall))
+    return 0
+
+
+def report_regressions(problems: list[str]) -> int:
+    if not problems:
+        print("no regressions against baseline")
+        return 0
+    print(f"{len(problems)} regression(s) against baseline:")
+    for problem in problems:
+        print(f"  {problem}")
+    return 1
+
+
+def bench_compare(args: argparse.Namespace) -> int:
+    baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+    current = json.loads(Path(args.current).read_text(encoding="utf-8"))
+    return report_regressions(compare_results(baseline, current, args.threshold, args.min_wall))
+
+
+def add_compare_options(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.15,
+        help="Relative change that counts as a regression (default: 0.15)",
+    )
+    parser.add_argument(
+        "--min-wall",
+        type=float,
+        default=0.01,
+        help="Skip timing checks for stages faster than this in the baseline, in seconds (default: 0.01)",
+    )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark market_scan.py on synthetic data.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    signals = sub.add_parser("signals", help="Review signal matching throughput")
+    signals.add_argument("--reviews", type=int, default=100_000, help="Synthetic reviews to scan (default: 100000)")
+    signals.add_argument("--repeat", type=int, default=3, help="Runs per variant; best time is reported (default: 3)")
+    signals.add_argument("--seed", type=int, default=7, help="Synthetic data seed (default: 7)")
+    signals.set_defaults(func=bench_signals)
+
+    select = sub.add_parser("select", help="select_apps equivalence with the original and scaling")
+    select.add_argument("--rows", default="1000,10000,100000", help="Comma-separated row counts to time")
+    select.add_argument("--trials", type=int, default=2000, help="Randomized equivalence trials (default: 2000)")
+    select.add_argument("--repeat", type=int, default=3, help="Runs per variant; best time is reported (default: 3)")
+    select.add_argument("--seed", type=int, default=7, help="Synthetic data seed (default: 7)")
+    select.set_defaults(func=bench_select)
+
+    check_select = sub.add_parser("check-select", help="select_apps equivalence with the original only, no timing")
+    check_select.add_argument("--trials", type=int, default=2000, help="Randomized equivalence trials (default: 2000)")
+    check_select.add_argument("--seed", type=int, default=7, help="Synthetic data seed (default: 7)")
+    check_select.set_defaults(func=bench_check_select)
+
+    pipeline = sub.add_parser("pipeline", help="Per-stage timings, latency percentiles and peak RSS across scales")
+    pipeline.add_argument("--apps", default="20,200", help="Comma-separated app counts, 20-5000 (default: 20,200)")
+    pipeline.add_argument(
+        "--reviews",
+        default="100,1000",
+        help="Comma-separated reviews per app, 100-100000 (default: 100,1000)",
+    )
+    pipeline.add_argument(
+        "--max-total-reviews",
+        type=int,
+        default=2_000_000,
+        help="Skip scale points with more reviews than this in total (default: 2000000)",
+    )
+    pipeline.add_argument("--workers", type=int, default=1, help="Discovery/metadata workers (default: 1)")
+    pipeline.add_argument("--seed", type=int, default=7, help="Synthetic data seed (default: 7)")
+    pipeline.add_argument(
+        "--fixtures",
+        default="",
+        help="Replay a fixture archive from market_scan.py --record-fixtures instead of synthetic data "
+        "(--apps and --reviews are then ignored)",
+    )
+    pipeline.add_argument("--out", default="", help="Write results as JSON to this path")
+    pipeline.add_argument("--baseline", default="", help="Compare against this earlier results file; exit 1 on regressions")
+    add_compare_options(pipeline)
+    pipeline.set_defaults(func=bench_pipeline)
+
+    run_one = sub.add_parser("run-one", help="One pipeline scale point as JSON (used by 'pipeline')")
+    run_one.add_argument("--apps", type=int, required=True)
+    run_one.add_argument("--reviews", type=int, required=True)
+    run_one.add_argument("--seed", type=int, default=7)
+    run_one.add_argument("--workers", type=int, default=1)
+    run_one.add_argument("--fixtures", default="")
+    run_one.set_defaults(func=bench_run_one)
+
+    compare = sub.add_parser("compare", help="Flag regressions between two pipeline results files")
+    compare.add_argument("baseline", help="Earlier results file")
+    compare.add_argument("current", help="New results file")
+    add_compare_options(compare)
+    compare.set_defaults(func=bench_compare)
+
+    args = parser.parse_args()
+    return int(args.func(args))
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
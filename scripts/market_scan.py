@@ -5,32 +5,73 @@ Generate a richer market intelligence report for addiction-blocking products.
 Outputs:
 - artifacts/market/market_scan_latest.md
 - artifacts/market/market_scan_latest.json
+- artifacts/market/market_scan_latest.jsonl (one record per source/app/rollup/task)
 - artifacts/market/ui_ux_tasks_latest.md
 
 Data sources:
 - Google Play app discovery + metadata + newest reviews
 - Reachability checks for Sensor Tower / AppMagic / data.ai
+
+Re-render the markdown from a saved payload, offline:
+- python3 scripts/market_scan.py render --from artifacts/market/market_scan_latest.json
 """
 
 from __future__ import annotations
 
 import argparse
+import bisect
+import gzip
+import hashlib
+import heapq
 import json
+import math
+import os
+import random
 import re
-from collections import defaultdict
+import shutil
+import sys
+import threading
+import time
+import zlib
+from array import array
+from collections import defaultdict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from contextlib import contextmanager
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any
-from urllib.error import HTTPError, URLError
-from urllib.request import Request, urlopen
+from typing import TYPE_CHECKING, Any, Iterator
+from urllib.parse import urljoin, urlsplit
+
+if TYPE_CHECKING:
+    import http.client
+
+# Heavy or optional modules (google_play_scraper, http.client, ssl, sqlite3,
+# multiprocessing) are imported where they are first needed, so that
+# ``render`` and other offline paths start fast.
+Sort: Any = None
+gp_app: Any = None
+gp_reviews: Any = None
+gp_search: Any = None
+
 
-try:
-    from google_play_scraper import Sort, app as gp_app, reviews as gp_reviews, search as gp_search
-except Exception:  # pragma: no cover - handled by runtime checks
-    Sort = None
-    gp_app = None
-    gp_reviews = None
-    gp_search = None
+def load_play_scraper() -> bool:
+    """Bind the google_play_scraper entry points on first use; False if it is missing.
+
+    Names that are already bound (e.g. by a test double) are left alone.
+    """
+    global Sort, gp_app, gp_reviews, gp_search
+    if None in (Sort, gp_app, gp_reviews, gp_search):
+        try:
+            import google_play_scraper
+        except Exception:  # pragma: no cover - handled by runtime checks
+            return False
+        Sort = Sort or google_play_scraper.Sort
+        gp_app = gp_app or google_play_scraper.app
+        gp_reviews = gp_reviews or google_play_scraper.reviews
+        gp_search = gp_search or google_play_scraper.search
+    return True
 
 
 SOURCE_URLS: list[tuple[str, str]] = [
@@ -44,6 +85,15 @@ SOURCE_URLS: list[tuple[str, str]] = [
     ("data.ai", "https://www.data.ai"),
 ]
 
+PLAY_HOST = "play.google.com"
+
+# Seconds a cached Play response stays fresh, per call type.
+DEFAULT_CACHE_TTL_S: dict[str, float] = {
+    "search": 12 * 3600,
+    "app": 24 * 3600,
+    "reviews": 6 * 3600,
+}
+
 SEARCH_SEGMENTS: dict[str, list[str]] = {
     "porn_blocker": [
         "porn blocker",
@@ -93,6 +143,14 @@ SEED_PACKAGE_IDS: list[str] = [
 
 CATEGORY_PRIORITY = ["porn_blocker", "gambling_blocker", "focus_blocker", "safe_browser", "other"]
 
+# Apps selected per category, filled in this order.
+DEFAULT_CATEGORY_CAPS: dict[str, int] = {
+    "porn_blocker": 5,
+    "gambling_blocker": 5,
+    "focus_blocker": 6,
+    "safe_browser": 3,
+}
+
 CATEGORY_KEYWORDS: dict[str, list[str]] = {
     "porn_blocker": ["porn", "adult", "nsfw", "xxx", "explicit"],
     "gambling_blocker": ["gambling", "casino", "bet", "sportsbook", "slots"],
@@ -138,6 +196,9 @@ SIGNALS: dict[str, list[str]] = {
     "gambling_need": ["gambling", "casino", "bet", "slots"],
 }
 
+# Signals reported per category in rollups (the *_need signals stay per-app).
+ROLLUP_SIGNALS = ["paywall", "bugs", "bypass", "effective", "ui_praise", "ui_confusion"]
+
 
 def now_iso() -> str:
     return datetime.now(timezone.utc).replace(microsecond=0).isoformat()
@@ -149,6 +210,21 @@ def safe_pct(numer: int, denom: int) -> float:
     return round((numer / denom) * 100.0, 1)
 
 
+def wilson_width_pct(count: int, total: int, z: float = 1.96) -> float:
+    """Width, in percentage points, of the Wilson score interval for ``count`` of ``total``."""
+    if total <= 0:
+        return 100.0
+    p = count / total
+    z2n = z * z / total
+    half = z * math.sqrt(p * (1.0 - p) / total + z2n / (4.0 * total)) / (1.0 + z2n)
+    return 200.0 * half
+
+
+def signal_ci_width_pct(counts: list[int], total: int) -> float:
+    """The widest 95% interval among the ``SIGNALS`` percentages, in points."""
+    return round(max((wilson_width_pct(c, total) for c in counts), default=100.0), 1)
+
+
 def parse_installs_count(installs: str | None) -> int:
     if not installs:
         return 0
@@ -161,354 +237,2513 @@ def parse_installs_count(installs: str | None) -> int:
         return 0
 
 
+def next_installs_bucket(count: int) -> int:
+    """The Play install bucket above ``count`` (1, 5, 10, 50, 100, ...)."""
+    if count <= 0:
+        return 1
+    magnitude = 10 ** (len(str(count)) - 1)
+    return magnitude * 5 if count < magnitude * 5 else magnitude * 10
+
+
 def normalize_text(text: str) -> str:
-    return re.sub(r"\s+", " ", (text or "").strip().lower())
+    # str.split() and the regex \s agree on what counts as whitespace.
+    return " ".join((text or "").lower().split())
 
 
-def fetch_url_status(url: str, timeout_s: int = 15) -> dict[str, Any]:
-    req = Request(
-        url,
-        headers={
-            "User-Agent": (
-                "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
-                "AppleWebKit/537.36 (KHTML, like Gecko) "
-                "Chrome/122.0.0.0 Safari/537.36"
-            )
-        },
-    )
+class KeywordMatcher:
+    """Compiled form of a ``{label: keywords}`` table.
+
+    ``scan`` answers "which labels have a keyword in this text" for a whole
+    batch at once. The normalized texts are joined with newlines, which
+    normalized text never contains. Each keyword is then located with one
+    C-level ``str.find`` sweep over the joined text. After a hit the sweep
+    jumps straight to the next text. Results match
+    ``any(k in text for k in keywords)`` per label exactly. CPython's regex
+    alternation (and a pure-Python Aho-Corasick) measured several times
+    slower than these substring sweeps.
+    """
+
+    def __init__(self, table: dict[str, list[str]]) -> None:
+        self.labels: tuple[str, ...] = tuple(table)
+        self._plan: tuple[tuple[int, tuple[str, ...]], ...] = tuple(
+            (1 << bit, tuple(dict.fromkeys(keywords))) for bit, keywords in enumerate(table.values())
+        )
+
+    def scan(self, texts: list[str]) -> list[int]:
+        """Per-text bitmask of matching labels; ``texts`` must be normalized."""
+        masks = [0] * len(texts)
+        if not texts:
+            return masks
+        starts: list[int] = []
+        offset = 0
+        for text in texts:
+            starts.append(offset)
+            offset += len(text) + 1
+        starts.append(offset)
+        blob = "\n".join(texts)
+        find = blob.find
+        for bit, keywords in self._plan:
+            for keyword in keywords:
+                pos = find(keyword)
+                while pos != -1:
+                    idx = bisect.bisect_right(starts, pos) - 1
+                    masks[idx] |= bit
+                    pos = find(keyword, starts[idx + 1])
+        return masks
+
+    def count(self, texts: list[str]) -> dict[str, int]:
+        """Number of texts matching each label."""
+        totals = [0] * len(self.labels)
+        for mask in self.scan(texts):
+            while mask:
+                low = mask & -mask
+                totals[low.bit_length() - 1] += 1
+                mask ^= low
+        return dict(zip(self.labels, totals))
+
+
+SIGNAL_MATCHER = KeywordMatcher(SIGNALS)
+
+# Keyword groups the app classifiers test, matched once per app into the
+# packed ``text_hits`` bitset. The views are the title plus
+# title/summary/description with the description cut at the length each
+# classifier has always used.
+TEXT_KEYWORD_GROUPS: dict[str, list[str]] = {
+    **CATEGORY_KEYWORDS,
+    "strict_intent": STRICT_PROTECTION_INTENT_KEYWORDS,
+    "general_intent": GENERAL_INTENT_KEYWORDS,
+    "gambling_operator": GAMBLING_OPERATOR_KEYWORDS,
+    "block": ["block"],
+    "porn_or_gambling": ["porn", "gambling"],
+    "vpn": ["vpn"],
+}
+TEXT_VIEW_LIMITS: dict[str, int] = {"text_2000": 2000, "text_1200": 1200, "text_1600": 1600}
+TEXT_MATCHER = KeywordMatcher(TEXT_KEYWORD_GROUPS)
+TEXT_VIEWS: list[str] = ["title", *TEXT_VIEW_LIMITS]
+# Bit of (view, group) in a packed ``text_hits`` int: one block of group bits per view.
+TEXT_HIT_BITS: dict[str, dict[str, int]] = {
+    view: {label: 1 << (v * len(TEXT_MATCHER.labels) + bit) for bit, label in enumerate(TEXT_MATCHER.labels)}
+    for v, view in enumerate(TEXT_VIEWS)
+}
+# Changes whenever the meaning of a packed ``text_hits`` int would.
+TEXT_MATCHER_ID = hashlib.sha1(
+    json.dumps([TEXT_KEYWORD_GROUPS, TEXT_VIEWS, TEXT_VIEW_LIMITS], sort_keys=True).encode("utf-8")
+).hexdigest()[:12]
+
+
+def call_with_timeout(
+    fn: Any,
+    timeout_s: float | None,
+    executor: ThreadPoolExecutor,
+    on_finish: Any = None,
+) -> Any:
+    """Run a blocking call on ``executor``, raising TimeoutError if it does not finish in time.
+
+    The scraper offers no cancellation, so a timed-out call keeps its
+    executor thread until it ends, and its result is discarded.
+    ``on_finish(error)`` runs once the call has really ended, with the
+    TimeoutError if the caller gave up on it, so whatever it releases stays
+    held while the call is in flight. Without a timeout, ``fn`` runs in the
+    calling thread.
+    """
+    if not timeout_s or timeout_s <= 0:
+        try:
+            value = fn()
+        except BaseException as e:
+            if on_finish is not None:
+                on_finish(e)
+            raise
+        if on_finish is not None:
+            on_finish(None)
+        return value
+
+    outcome: dict[str, Any] = {}
+    lock = threading.Lock()
+
+    def target() -> None:
+        try:
+            outcome["value"] = fn()
+        except BaseException as e:  # re-raised in the caller thread
+            outcome["error"] = e
+        with lock:
+            outcome["done"] = True
+            error = outcome.get("timeout", outcome.get("error"))
+        if on_finish is not None:
+            on_finish(error)
+
+    future = executor.submit(target)
+    try:
+        future.result(timeout_s)
+    except FutureTimeoutError:
+        pass
+    with lock:
+        if not outcome.get("done"):
+            outcome["timeout"] = TimeoutError(f"no response after {timeout_s:g}s")
+    if "timeout" in outcome:
+        raise outcome["timeout"]
+    future.result()
+    if "error" in outcome:
+        raise outcome["error"]
+    return outcome.get("value")
+
+
+@contextmanager
+def socket_default_timeout(timeout_s: float | None) -> Iterator[None]:
+    """Set the process-wide socket default timeout for the block, then restore it.
+
+    google_play_scraper opens its connections without a timeout, so this is
+    the only bound on how long one of its reads can block.
+    """
+    import socket
+
+    previous = socket.getdefaulttimeout()
+    if timeout_s and timeout_s > 0:
+        socket.setdefaulttimeout(timeout_s)
     try:
-        with urlopen(req, timeout=timeout_s) as resp:
-            status = int(resp.getcode() or 0)
-            final_url = resp.geturl()
-            reachable = 200 <= status < 400
-            login_gate = "login" in final_url.lower()
+        yield
+    finally:
+        socket.setdefaulttimeout(previous)
+
+
+THROTTLE_STATUSES = {429, 503}
+# How google_play_scraper's ExtraHTTPError states the HTTP status.
+_SCRAPER_STATUS_RE = re.compile(r"Status code (\d{3}) returned")
+
+
+def classify_play_error(exc: BaseException) -> str | None:
+    """``"throttle"``, ``"transient"`` or None (not worth retrying) for a failed call.
+
+    google_play_scraper reports HTTP failures as ``ExtraHTTPError("... Status
+    code 503 returned.")`` and Play's rate limiting as ``PlayGatewayError``,
+    so the status is read from the exception's ``code`` when it has one and
+    otherwise only from that exact phrase. Other numbers in a message (a
+    "500" in an unrelated error) are not taken for a status.
+    """
+    message = str(exc)
+    if "PlayGatewayError" in message:
+        return "throttle"
+    status = getattr(exc, "code", None)
+    if not isinstance(status, int):
+        match = _SCRAPER_STATUS_RE.search(message)
+        status = int(match.group(1)) if match else None
+    if status is not None:
+        if status in THROTTLE_STATUSES:
+            return "throttle"
+        return "transient" if 500 <= status < 600 else None
+    if isinstance(exc, OSError):  # timeouts, resets, DNS and TLS failures
+        return "transient"
+    return None
+
+
+def backoff_delay(attempt: int, base_s: float, max_s: float) -> float:
+    """Exponential backoff with full jitter for retry number ``attempt`` (0-based)."""
+    return random.uniform(0.0, min(max_s, base_s * (2**attempt)))
+
+
+@dataclass
+class _Breaker:
+    failures: int = 0
+    open_until: float = 0.0
+    cooldown_s: float = 0.0
+    trial: bool = False
+
+
+class RequestGate:
+    """Shared, adaptive limits for outbound requests across worker threads.
+
+    ``max_in_flight`` caps concurrent requests globally (0 = no cap). The
+    effective limit adapts (AIMD): each throttled response halves it, and
+    every ``limit`` successful requests raise it by one, back up to
+    ``max_in_flight``. ``rate_per_host`` refills a token bucket per host
+    that allows ``burst`` back-to-back starts (0 = no limit).
+
+    After ``breaker_threshold`` consecutive throttled or transient failures
+    to a host, its circuit opens. New requests then wait out a cooldown,
+    after which one trial request is let through. A failed trial doubles the
+    cooldown, up to ``breaker_max_cooldown_s``, and a success closes the
+    circuit.
+
+    ``request`` yields the seconds it spent held back by these limits.
+    Outcomes are read from the exception, if any, leaving the block.
+    ``acquire`` is the same for a request that may outlive its caller: the
+    slot stays taken until the returned ``release(error)`` runs.
+    """
+
+    def __init__(
+        self,
+        max_in_flight: int = 0,
+        rate_per_host: float = 0.0,
+        burst: int = 1,
+        breaker_threshold: int = 5,
+        breaker_cooldown_s: float = 15.0,
+        breaker_max_cooldown_s: float = 120.0,
+    ) -> None:
+        self.max_in_flight = max(0, max_in_flight)
+        self.limit = self.max_in_flight
+        self._rate = rate_per_host
+        self._burst = max(1, burst)
+        self._breaker_threshold = max(1, breaker_threshold)
+        self._breaker_cooldown_s = breaker_cooldown_s
+        self._breaker_max_cooldown_s = max(breaker_cooldown_s, breaker_max_cooldown_s)
+        self._cond = threading.Condition()
+        self._in_flight = 0
+        self._successes = 0
+        self._epoch = 0
+        self._buckets: dict[str, tuple[float, float]] = {}
+        self._breakers: dict[str, _Breaker] = {}
+        self.throttled_responses = 0
+        self.breaker_trips = 0
+
+    @contextmanager
+    def request(self, host: str = PLAY_HOST) -> Iterator[float]:
+        waited, release = self.acquire(host)
+        error: BaseException | None = None
+        try:
+            yield waited
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            release(error)
+
+    def acquire(self, host: str = PLAY_HOST) -> tuple[float, Any]:
+        waited = self._wait_breaker(host)
+        epoch, slot_wait = self._acquire_slot()
+        try:
+            waited += slot_wait + self._take_token(host)
+        except BaseException:
+            self._release(host, epoch, "other")
+            raise
+
+        def release(error: BaseException | None) -> None:
+            if error is None:
+                outcome = "ok"
+            elif isinstance(error, Exception):
+                outcome = classify_play_error(error) or "other"
+            else:
+                outcome = "other"
+            self._release(host, epoch, outcome)
+
+        return waited, release
+
+    def stats(self) -> dict[str, Any]:
+        with self._cond:
             return {
-                "url": url,
-                "status": status,
-                "reachable": reachable,
-                "data_accessible": reachable and not login_gate,
-                "final_url": final_url,
-                "error": "",
+                "max_in_flight": self.max_in_flight,
+                "limit": self.limit,
+                "throttled_responses": self.throttled_responses,
+                "breaker_trips": self.breaker_trips,
             }
-    except HTTPError as e:
-        return {
-            "url": url,
-            "status": int(e.code),
-            "reachable": False,
-            "data_accessible": False,
-            "final_url": url,
-            "error": f"http_error:{e.code}",
-        }
-    except URLError as e:
+
+    def _wait_breaker(self, host: str) -> float:
+        waited = 0.0
+        while True:
+            with self._cond:
+                breaker = self._breakers.get(host)
+                if breaker is None or not breaker.open_until:
+                    return waited
+                delay = breaker.open_until - time.monotonic()
+                if delay <= 0 and not breaker.trial:
+                    breaker.trial = True
+                    return waited
+            # While a trial request is out, poll until it settles the circuit.
+            delay = delay if delay > 0 else 0.05
+            time.sleep(delay)
+            waited += delay
+
+    def _acquire_slot(self) -> tuple[int, float]:
+        if not self.max_in_flight:
+            with self._cond:
+                return self._epoch, 0.0
+        started = time.monotonic()
+        held_back = False
+        with self._cond:
+            while self._in_flight >= self.limit:
+                held_back = held_back or self.limit < self.max_in_flight
+                self._cond.wait()
+            self._in_flight += 1
+            epoch = self._epoch
+        # Queueing at the configured cap is normal; only time lost to a
+        # reduced limit counts as throttling.
+        return epoch, time.monotonic() - started if held_back else 0.0
+
+    def _take_token(self, host: str) -> float:
+        if self._rate <= 0:
+            return 0.0
+        with self._cond:
+            now = time.monotonic()
+            tokens, updated = self._buckets.get(host, (float(self._burst), now))
+            tokens = min(float(self._burst), tokens + (now - updated) * self._rate) - 1.0
+            self._buckets[host] = (tokens, now)
+        # A negative balance is a reservation: wait until it is paid back.
+        wait = -tokens / self._rate if tokens < 0 else 0.0
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    def _release(self, host: str, epoch: int, outcome: str) -> None:
+        with self._cond:
+            if self.max_in_flight:
+                self._in_flight -= 1
+            if outcome == "throttle":
+                self.throttled_responses += 1
+                # Only the first throttle of a generation cuts the limit;
+                # requests started before the cut saw the old limit.
+                if self.max_in_flight and epoch == self._epoch:
+                    self.limit = max(1, self.limit // 2)
+                    self._epoch += 1
+                self._successes = 0
+            elif outcome == "ok" and self.limit < self.max_in_flight:
+                self._successes += 1
+                if self._successes >= self.limit:
+                    self.limit += 1
+                    self._successes = 0
+
+            breaker = self._breakers.setdefault(host, _Breaker())
+            if outcome in ("throttle", "transient"):
+                breaker.failures += 1
+                now = time.monotonic()
+                if breaker.trial:
+                    breaker.trial = False
+                    breaker.cooldown_s = min(self._breaker_max_cooldown_s, breaker.cooldown_s * 2)
+                    breaker.open_until = now + breaker.cooldown_s
+                elif not breaker.open_until and breaker.failures >= self._breaker_threshold:
+                    self.breaker_trips += 1
+                    breaker.cooldown_s = self._breaker_cooldown_s
+                    breaker.open_until = now + breaker.cooldown_s
+            else:
+                # Any answer, even a 404, shows the host is serving again.
+                self._breakers[host] = _Breaker()
+            self._cond.notify_all()
+
+
+@dataclass
+class CallRecord:
+    """Mutable facts about one in-progress call, filled in by the caller."""
+
+    bytes: int = 0
+    cached: bool = False
+    retries: int = 0
+    throttled_s: float = 0.0
+
+
+class PipelineProfiler:
+    """Wall time and call counters per pipeline stage and per external call type.
+
+    Stages are entered one at a time from the main thread. Calls may come
+    from worker threads and are charged to the stage that is active, unless
+    a stage is named explicitly. Every stage and call is also kept as a
+    Chrome trace event (``chrome://tracing`` / Perfetto).
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._origin = time.perf_counter()
+        self._current = "setup"
+        self.stages: dict[str, dict[str, float]] = {}
+        self.calls: dict[str, dict[str, float]] = {}
+        self.events: list[dict[str, Any]] = []
+
+    def _stage_stats(self, name: str) -> dict[str, float]:
+        return self.stages.setdefault(
+            name,
+            {"wall_s": 0.0, "requests": 0, "cache_hits": 0, "bytes": 0, "retries": 0, "throttled_s": 0.0, "errors": 0},
+        )
+
+    def _event(self, name: str, category: str, started: float, ended: float, args: dict[str, Any]) -> None:
+        self.events.append(
+            {
+                "name": name,
+                "cat": category,
+                "ph": "X",
+                "ts": round((started - self._origin) * 1e6),
+                "dur": round((ended - started) * 1e6),
+                "pid": os.getpid(),
+                "tid": threading.get_ident(),
+                "args": args,
+            }
+        )
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        previous = self._current
+        self._current = name
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            ended = time.perf_counter()
+            with self._lock:
+                self._stage_stats(name)["wall_s"] += ended - started
+                self._event(name, "stage", started, ended, {})
+            self._current = previous
+
+    @contextmanager
+    def call(self, call_type: str, stage: str | None = None, external: bool = True) -> Iterator[CallRecord]:
+        """Time one call; ``external=False`` marks local work that is not a request."""
+        record = CallRecord()
+        stage_name = stage or self._current
+        started = time.perf_counter()
+        failed = False
+        try:
+            yield record
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            ended = time.perf_counter()
+            elapsed = ended - started
+            with self._lock:
+                stats = self.calls.setdefault(
+                    call_type,
+                    {
+                        "count": 0,
+                        "cache_hits": 0,
+                        "time_s": 0.0,
+                        "max_s": 0.0,
+                        "bytes": 0,
+                        "retries": 0,
+                        "throttled_s": 0.0,
+                        "errors": 0,
+                    },
+                )
+                stage_stats = self._stage_stats(stage_name)
+                stats["count"] += 1
+                stats["time_s"] += elapsed
+                stats["max_s"] = max(stats["max_s"], elapsed)
+                stats["bytes"] += record.bytes
+                stats["retries"] += record.retries
+                stats["throttled_s"] += record.throttled_s
+                stage_stats["bytes"] += record.bytes
+                stage_stats["retries"] += record.retries
+                stage_stats["throttled_s"] += record.throttled_s
+                if record.cached:
+                    stats["cache_hits"] += 1
+                    stage_stats["cache_hits"] += 1
+                elif external:
+                    stage_stats["requests"] += 1
+                if failed:
+                    stats["errors"] += 1
+                    stage_stats["errors"] += 1
+                self._event(
+                    call_type,
+                    "call",
+                    started,
+                    ended,
+                    {
+                        "stage": stage_name,
+                        "cached": record.cached,
+                        "bytes": record.bytes,
+                        "retries": record.retries,
+                        "error": failed,
+                    },
+                )
+
+    def absorb(self, other: PipelineProfiler, prefix: str = "") -> None:
+        """Merge another profiler's stages, calls and trace events into this one."""
+        with other._lock:
+            stages = {name: dict(stats) for name, stats in other.stages.items()}
+            calls = {name: dict(stats) for name, stats in other.calls.items()}
+            shift = round((other._origin - self._origin) * 1e6)
+            events = [{**e, "name": prefix + e["name"], "ts": e["ts"] + shift} for e in other.events]
+        with self._lock:
+            for name, stats in stages.items():
+                mine = self._stage_stats(prefix + name)
+                for key, value in stats.items():
+                    mine[key] += value
+            for name, stats in calls.items():
+                mine = self.calls.setdefault(name, dict.fromkeys(stats, 0))
+                for key, value in stats.items():
+                    mine[key] = max(mine[key], value) if key == "max_s" else mine[key] + value
+            self.events.extend(events)
+
+    def summary(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "stages": {name: _rounded(stats) for name, stats in self.stages.items()},
+                "calls": {name: _rounded(stats) for name, stats in self.calls.items()},
+            }
+
+    def format_table(self) -> str:
+        summary = self.summary()
+        lines = [
+            f"{'stage':<22} {'wall s':>8} {'requests':>9} {'cached':>7} {'bytes':>12} {'retries':>8} "
+            f"{'throttled s':>12} {'errors':>7}",
+        ]
+        for name, st in summary["stages"].items():
+            lines.append(
+                f"{name:<22} {st['wall_s']:>8.2f} {int(st['requests']):>9} {int(st['cache_hits']):>7} "
+                f"{int(st['bytes']):>12} {int(st['retries']):>8} {st.get('throttled_s', 0.0):>12.2f} {int(st['errors']):>7}"
+            )
+        lines.append("")
+        lines.append(f"{'call':<22} {'count':>8} {'cached':>7} {'total s':>9} {'avg ms':>8} {'max ms':>8} {'errors':>7}")
+        for name, st in summary["calls"].items():
+            count = int(st["count"])
+            avg_ms = (st["time_s"] / count * 1000.0) if count else 0.0
+            lines.append(
+                f"{name:<22} {count:>8} {int(st['cache_hits']):>7} {st['time_s']:>9.2f} {avg_ms:>8.1f} "
+                f"{st['max_s'] * 1000.0:>8.1f} {int(st['errors']):>7}"
+            )
+        return "\n".join(lines)
+
+    def write_trace(self, path: Path) -> None:
+        with self._lock:
+            events = list(self.events)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps({"traceEvents": events, "displayTimeUnit": "ms"}), encoding="utf-8")
+
+
+def _rounded(stats: dict[str, float]) -> dict[str, float]:
+    return {k: round(v, 4) if isinstance(v, float) else v for k, v in stats.items()}
+
+
+def _payload_size(value: Any) -> int:
+    """Approximate bytes received for a scraper response (its JSON size)."""
+    try:
+        return len(json.dumps(value, default=_json_default, ensure_ascii=False).encode("utf-8"))
+    except (TypeError, ValueError):
+        return 0
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"__datetime__": value.isoformat()}
+    if isinstance(value, (set, frozenset)):
+        return sorted(value)
+    return str(value)
+
+
+def _json_object_hook(obj: dict[str, Any]) -> Any:
+    if len(obj) == 1 and "__datetime__" in obj:
+        return datetime.fromisoformat(obj["__datetime__"])
+    return obj
+
+
+class ScraperCache:
+    """On-disk cache of Play responses, stored in SQLite.
+
+    Entries are content-addressed by a hash of the call name and its
+    arguments. Every call type has its own TTL. When the stored payloads grow
+    past ``max_bytes``, the least recently read entries are evicted first.
+    With ``refresh`` set, reads always miss but fresh responses are still
+    written.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Path,
+        ttl_s: dict[str, float] | None = None,
+        max_bytes: int = 256 * 1024 * 1024,
+        refresh: bool = False,
+    ) -> None:
+        import sqlite3
+
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        self.path = cache_dir / "play_responses.sqlite3"
+        self.ttl_s = {**DEFAULT_CACHE_TTL_S, **(ttl_s or {})}
+        self.max_bytes = max_bytes
+        self.refresh = refresh
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, timeout=30, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            "key TEXT PRIMARY KEY, call TEXT NOT NULL, created_at REAL NOT NULL, "
+            "accessed_at REAL NOT NULL, size INTEGER NOT NULL, value BLOB NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS entries_accessed ON entries(accessed_at)")
+        self._total_bytes = int(self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0])
+
+    @staticmethod
+    def make_key(call: str, key_parts: list[Any]) -> str:
+        raw = json.dumps([call, *key_parts], sort_keys=True, default=_json_default, ensure_ascii=True)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def get(self, call: str, key_parts: list[Any]) -> tuple[bool, Any]:
+        if self.refresh:
+            self.misses += 1
+            return False, None
+        key = self.make_key(call, key_parts)
+        now = time.time()
+        with self._lock:
+            found = self._conn.execute("SELECT created_at, size, value FROM entries WHERE key = ?", (key,)).fetchone()
+            if found is None:
+                self.misses += 1
+                return False, None
+            created_at, size, blob = found
+            if now - float(created_at) > self.ttl_s.get(call, 0.0):
+                self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                self._total_bytes -= int(size)
+                self.misses += 1
+                return False, None
+            self._conn.execute("UPDATE entries SET accessed_at = ? WHERE key = ?", (now, key))
+            self.hits += 1
+        return True, json.loads(zlib.decompress(blob).decode("utf-8"), object_hook=_json_object_hook)
+
+    def put(self, call: str, key_parts: list[Any], value: Any) -> None:
+        key = self.make_key(call, key_parts)
+        blob = zlib.compress(json.dumps(value, default=_json_default, ensure_ascii=True).encode("utf-8"))
+        now = time.time()
+        with self._lock:
+            old = self._conn.execute("SELECT size FROM entries WHERE key = ?", (key,)).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (key, call, created_at, accessed_at, size, value) VALUES (?, ?, ?, ?, ?, ?)",
+                (key, call, now, now, len(blob), blob),
+            )
+            self._total_bytes += len(blob) - (int(old[0]) if old else 0)
+            if self._total_bytes > self.max_bytes:
+                self._evict(target=int(self.max_bytes * 0.9))
+
+    def _evict(self, target: int) -> None:
+        victims: list[str] = []
+        for key, size in self._conn.execute("SELECT key, size FROM entries ORDER BY accessed_at ASC"):
+            if self._total_bytes <= target:
+                break
+            victims.append(key)
+            self._total_bytes -= int(size)
+        self._conn.executemany("DELETE FROM entries WHERE key = ?", [(k,) for k in victims])
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def _token_state(token: Any) -> dict[str, Any] | None:
+    """Plain-data snapshot of a review continuation token."""
+    if token is None:
+        return None
+    if isinstance(token, dict):
+        return token
+    return {
+        name: getattr(token, name, None)
+        for name in ("token", "lang", "country", "sort", "count", "filter_score_with", "filter_device_with")
+    }
+
+
+def _restore_token(token: Any) -> Any:
+    """Turn a cached token snapshot back into the scraper's token object."""
+    if not isinstance(token, dict):
+        return token
+    from google_play_scraper.features.reviews import _ContinuationToken
+
+    return _ContinuationToken(**token)
+
+
+class PlayClient:
+    """Single entry point for Google Play calls.
+
+    It applies the request gate and per-call timeout, consults the response
+    cache when one is configured, and reports every call to the profiler.
+    Throttled (429/503) and transient (5xx, network) failures are retried up
+    to ``max_retries`` times with jittered exponential backoff. Retries and
+    the seconds spent held back land on the call's profiler record.
+
+    With a ``recorder`` every response (or final error) is also written to a
+    fixture archive. With a ``replay`` backend, recorded responses are served
+    in place of the scraper, still through the gate, retries and profiler.
+
+    Timed calls run on ``executor``, which clients can share. Without one,
+    the client starts its own, with a thread per gate slot.
+    """
+
+    def __init__(
+        self,
+        gate: RequestGate | None = None,
+        timeout_s: float | None = None,
+        cache: ScraperCache | None = None,
+        profiler: PipelineProfiler | None = None,
+        max_retries: int = 4,
+        backoff_s: float = 1.0,
+        backoff_max_s: float = 30.0,
+        recorder: PlayFixtures | None = None,
+        replay: ReplayBackend | None = None,
+        executor: ThreadPoolExecutor | None = None,
+    ) -> None:
+        self.gate = gate or RequestGate()
+        self.timeout_s = timeout_s
+        if executor is None and timeout_s and timeout_s > 0:
+            executor = ThreadPoolExecutor(max_workers=self.gate.max_in_flight or 32, thread_name_prefix="gp-call")
+        self.executor = executor
+        self.cache = cache
+        self.profiler = profiler or PipelineProfiler()
+        self.max_retries = max(0, max_retries)
+        self.backoff_s = backoff_s
+        self.backoff_max_s = backoff_max_s
+        self.recorder = recorder
+        self.replay = replay
+
+    def _fetch(self, record: CallRecord, fn: Any, *args: Any, **kwargs: Any) -> Any:
+        attempt = 0
+        while True:
+            try:
+                # The slot is released when the call ends, not when it times
+                # out, so abandoned calls still count against --max-in-flight.
+                waited, release = self.gate.acquire(PLAY_HOST)
+                record.throttled_s += waited
+                return call_with_timeout(lambda: fn(*args, **kwargs), self.timeout_s, self.executor, release)
+            except Exception as e:
+                if attempt >= self.max_retries or classify_play_error(e) is None:
+                    raise
+                delay = backoff_delay(attempt, self.backoff_s, self.backoff_max_s)
+                attempt += 1
+                record.retries += 1
+                record.throttled_s += delay
+                time.sleep(delay)
+
+    def _call(
+        self,
+        call: str,
+        key_parts: list[Any],
+        fetch: Any,
+        encode: Any = None,
+        decode: Any = None,
+    ) -> Any:
+        """Run one call via the cache, the replay backend or the live ``fetch``.
+
+        ``encode`` turns a live response into the plain-data form stored by
+        the cache and fixture archives; ``decode`` turns that back into what
+        callers expect.
+        """
+        with self.profiler.call(call) as record:
+            if self.cache is not None:
+                hit, value = self.cache.get(call, key_parts)
+                if hit:
+                    record.cached = True
+                    return decode(value) if decode else value
+            try:
+                if self.replay is not None:
+                    value = self._fetch(record, self.replay.serve, call, key_parts)
+                    live = decode(value) if decode else value
+                else:
+                    live = self._fetch(record, fetch)
+                    value = encode(live) if encode else live
+            except Exception as e:
+                if self.recorder is not None:
+                    self.recorder.put(call, key_parts, error=e)
+                raise
+            record.bytes = _payload_size(value)
+        if self.cache is not None:
+            self.cache.put(call, key_parts, value)
+        if self.recorder is not None:
+            self.recorder.put(call, key_parts, value)
+        return live
+
+    def search(self, query: str, lang: str, country: str, n_hits: int) -> list[dict[str, Any]]:
+        return self._call(
+            "search",
+            [query, lang, country, n_hits],
+            lambda: gp_search(query, lang=lang, country=country, n_hits=n_hits),
+        )
+
+    def app(self, app_id: str, lang: str, country: str) -> dict[str, Any]:
+        return self._call("app", [app_id, lang, country], lambda: gp_app(app_id, lang=lang, country=country))
+
+    def reviews_page(
+        self,
+        package_name: str,
+        lang: str,
+        country: str,
+        count: int,
+        continuation_token: Any = None,
+    ) -> tuple[list[dict[str, Any]], Any]:
+        """One page of newest reviews plus the token for the next page.
+
+        Pages are cached by the token string they were requested with, so a
+        cached first page leads on to cached follow-up pages.
+        """
+        state = _token_state(continuation_token)
+        if state is not None and state.get("token") is None:
+            return [], continuation_token
+        return self._call(
+            "reviews",
+            [package_name, lang, country, count, state.get("token") if state else None],
+            lambda: gp_reviews(
+                package_name,
+                lang=lang,
+                country=country,
+                sort=Sort.NEWEST,
+                count=count,
+                continuation_token=_restore_token(continuation_token),
+            ),
+            encode=lambda page: {"batch": page[0], "token": _token_state(page[1])},
+            decode=lambda value: (value["batch"], value["token"]),
+        )
+
+
+class PlayFixtures:
+    """Archive of recorded Play responses, for offline replay.
+
+    The file is gzip-compressed JSON Lines. A header line is followed by one
+    line per call, holding the call's arguments and either its response (in
+    the plain-data form the cache stores) or the error it raised. Entries are
+    keyed like ``ScraperCache`` entries. Recording into an existing archive
+    adds to it, and ``save`` writes it atomically.
+    """
+
+    FORMAT = "market-scan-fixtures/1"
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self.entries: dict[str, dict[str, Any]] = {}
+        if path.exists():
+            with gzip.open(path, "rt", encoding="utf-8") as fh:
+                header = json.loads(fh.readline() or "{}")
+                if header.get("format") != self.FORMAT:
+                    raise ValueError(f"{path} is not a market_scan fixture archive")
+                for line in fh:
+                    entry = json.loads(line, object_hook=_json_object_hook)
+                    self.entries[entry["key"]] = entry
+
+    def get(self, call: str, key_parts: list[Any]) -> dict[str, Any] | None:
+        return self.entries.get(ScraperCache.make_key(call, key_parts))
+
+    def put(self, call: str, key_parts: list[Any], value: Any = None, error: BaseException | None = None) -> None:
+        entry: dict[str, Any] = {"key": ScraperCache.make_key(call, key_parts), "call": call, "args": key_parts}
+        if error is not None:
+            entry["error"] = {"type": type(error).__name__, "message": str(error)}
+        else:
+            entry["value"] = value
+        with self._lock:
+            self.entries[entry["key"]] = entry
+
+    def save(self) -> None:
+        with self._lock:
+            lines = [json.dumps({"format": self.FORMAT}, ensure_ascii=True)]
+            lines.extend(
+                json.dumps(entry, ensure_ascii=True, separators=(",", ":"), default=_json_default)
+                for entry in self.entries.values()
+            )
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        atomic_write_bytes(self.path, gzip.compress(("\n".join(lines) + "\n").encode("utf-8"), mtime=0))
+
+
+_REPLAYED_ERRORS: dict[str, type[Exception]] = {}
+
+
+def _replayed_error(type_name: str, message: str) -> Exception:
+    """An exception with the recorded type name, so reports read as in the live run."""
+    cls = _REPLAYED_ERRORS.get(type_name)
+    if cls is None:
+        cls = _REPLAYED_ERRORS.setdefault(type_name, type(type_name, (Exception,), {}))
+    return cls(message)
+
+
+class ReplayBackend:
+    """Stand-in for Google Play that serves responses from ``PlayFixtures``.
+
+    ``latency_s`` adds a simulated round trip of 0.5x to 1.5x that value, and
+    ``error_rate`` fails that share of attempts with the scraper's 503 error,
+    which the retry layer treats as throttling. Both are drawn from a RNG
+    seeded by (seed, call, attempt number), so a replay is reproducible
+    however threads interleave. Calls with no recording raise ``LookupError``.
+    """
+
+    def __init__(self, fixtures: PlayFixtures, latency_s: float = 0.0, error_rate: float = 0.0, seed: int = 0) -> None:
+        self.fixtures = fixtures
+        self.latency_s = latency_s
+        self.error_rate = error_rate
+        self.seed = seed
+        self._lock = threading.Lock()
+        self._attempts: dict[str, int] = defaultdict(int)
+
+    def serve(self, call: str, key_parts: list[Any]) -> Any:
+        key = ScraperCache.make_key(call, key_parts)
+        with self._lock:
+            self._attempts[key] += 1
+            attempt = self._attempts[key]
+        rng = random.Random(f"{self.seed}:{key}:{attempt}")
+        if self.latency_s > 0:
+            time.sleep(self.latency_s * rng.uniform(0.5, 1.5))
+        if self.error_rate > 0 and rng.random() < self.error_rate:
+            raise _replayed_error("ExtraHTTPError", "App not found. Status code 503 returned.")
+        entry = self.fixtures.entries.get(key)
+        if entry is None:
+            raise LookupError(f"no recorded response for {call} {key_parts}")
+        if "error" in entry:
+            raise _replayed_error(entry["error"]["type"], entry["error"]["message"])
+        return entry["value"]
+
+
+BROWSER_HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
+        "AppleWebKit/537.36 (KHTML, like Gecko) "
+        "Chrome/122.0.0.0 Safari/537.36"
+    ),
+    "Accept": "text/html,application/xhtml+xml,*/*;q=0.8",
+}
+
+# Statuses that may only mean "this server does not like HEAD".
+HEAD_FALLBACK_STATUSES = {400, 403, 404, 405, 406, 429, 500, 501, 503}
+
+
+class HostConnections:
+    """Keep-alive HTTP(S) connections, one per (scheme, host, port).
+
+    Not thread-safe: each probe worker owns its own instance, so requests to
+    the same host reuse one socket.
+    """
+
+    def __init__(self) -> None:
+        self._conns: dict[tuple[str, str, int], http.client.HTTPConnection] = {}
+
+    def get(self, scheme: str, host: str, port: int | None, timeout_s: float) -> http.client.HTTPConnection:
+        import http.client
+        import ssl
+
+        key = (scheme, host, port or (443 if scheme == "https" else 80))
+        conn = self._conns.get(key)
+        if conn is None:
+            if scheme == "https":
+                conn = http.client.HTTPSConnection(host, key[2], timeout=timeout_s, context=ssl.create_default_context())
+            else:
+                conn = http.client.HTTPConnection(host, key[2], timeout=timeout_s)
+            self._conns[key] = conn
+        conn.timeout = timeout_s
+        if conn.sock is not None:
+            conn.sock.settimeout(timeout_s)
+        return conn
+
+    def discard(self, conn: http.client.HTTPConnection) -> None:
+        conn.close()
+        self._conns = {k: c for k, c in self._conns.items() if c is not conn}
+
+    def close(self) -> None:
+        for conn in self._conns.values():
+            conn.close()
+        self._conns.clear()
+
+    def abort(self) -> None:
+        """Unblock socket I/O that the owning thread has in progress.
+
+        Safe to call from another thread: sockets are only shut down, so the
+        owner's pending call fails promptly and it still closes them itself.
+        """
+        import socket
+
+        for conn in list(self._conns.values()):
+            sock = conn.sock
+            if sock is not None:
+                try:
+                    sock.shutdown(socket.SHUT_RDWR)
+                except OSError:
+                    pass
+
+
+def _http_request(
+    connections: HostConnections,
+    method: str,
+    url: str,
+    timeout_s: float,
+    max_redirects: int = 5,
+    max_body: int = 2 * 1024 * 1024,
+    deadline: float | None = None,
+) -> tuple[int, str, int]:
+    """Issue ``method`` on ``url``, following redirects; returns (status, final_url, bytes).
+
+    With a ``deadline`` (``time.monotonic()``), every connect and read is
+    capped at the time left, and nothing new starts once it has passed.
+    """
+    import http.client
+
+    received = 0
+    for _ in range(max_redirects + 1):
+        parts = urlsplit(url)
+        path = parts.path or "/"
+        if parts.query:
+            path += "?" + parts.query
+        for attempt in range(2):
+            wait = timeout_s if deadline is None else min(timeout_s, deadline - time.monotonic())
+            if wait <= 0:
+                raise TimeoutError("timed out")
+            conn = connections.get(parts.scheme, parts.hostname or "", parts.port, wait)
+            try:
+                conn.request(method, path, headers=BROWSER_HEADERS)
+                resp = conn.getresponse()
+                break
+            except (http.client.RemoteDisconnected, BrokenPipeError, ConnectionResetError):
+                # A kept-alive socket the server already closed; retry once on a fresh one.
+                connections.discard(conn)
+                if attempt:
+                    raise
+            except Exception:
+                connections.discard(conn)
+                raise
+        body = resp.read(max_body) if method != "HEAD" else resp.read()
+        received += len(body)
+        if resp.will_close or (method != "HEAD" and not resp.isclosed()):
+            connections.discard(conn)
+        location = resp.getheader("Location")
+        if resp.status in (301, 302, 303, 307, 308) and location:
+            url = urljoin(url, location)
+            continue
+        return int(resp.status), url, received
+    raise http.client.HTTPException("too many redirects")
+
+
+def probe_url(
+    connections: HostConnections,
+    url: str,
+    timeout_s: float = 15,
+    deadline: float | None = None,
+) -> dict[str, Any]:
+    """Reachability of ``url``: HEAD first, then GET if HEAD is refused or fails.
+
+    I/O is capped at ``deadline`` when one is given (see ``_http_request``).
+    """
+    import socket
+
+    status, final_url, received, method = 0, url, 0, "HEAD"
+    error = ""
+    for method in ("HEAD", "GET"):
+        try:
+            status, final_url, received = _http_request(connections, method, url, timeout_s, deadline=deadline)
+            error = "" if status < 400 else f"http_error:{status}"
+        except (socket.timeout, TimeoutError):
+            status, final_url, error = 0, url, "url_error:timed out"
+        except OSError as e:
+            status, final_url, error = 0, url, f"url_error:{e}"
+        except Exception as e:  # pragma: no cover
+            status, final_url, error = 0, url, f"error:{type(e).__name__}"
+        if method == "HEAD" and (status == 0 or status in HEAD_FALLBACK_STATUSES):
+            continue
+        break
+
+    reachable = 200 <= status < 400
+    login_gate = "login" in final_url.lower()
+    return {
+        "url": url,
+        "status": status,
+        "reachable": reachable,
+        "data_accessible": reachable and not login_gate,
+        "final_url": final_url if not error else url,
+        "error": error,
+        "method": method,
+        "bytes": received,
+    }
+
+
+def fetch_url_status(url: str, timeout_s: int = 15) -> dict[str, Any]:
+    connections = HostConnections()
+    try:
+        return probe_url(connections, url, timeout_s=timeout_s)
+    finally:
+        connections.close()
+
+
+class SourceProber:
+    """Probes ``SOURCE_URLS`` on background threads while Play work runs.
+
+    There is one worker per host, and it reuses a single kept-alive
+    connection for that host's URLs. Probes share a total time budget: each
+    connect and read is capped at the time left, and ``results`` aborts
+    whatever is still in flight at the deadline, then joins every worker, so
+    no probe thread outlives it. Any probe unfinished by the deadline is
+    reported as ``budget_exceeded``.
+    """
+
+    def __init__(
+        self,
+        sources: list[tuple[str, str]],
+        timeout_s: float = 15,
+        budget_s: float = 30,
+        profiler: PipelineProfiler | None = None,
+    ) -> None:
+        self.sources = sources
+        self.timeout_s = timeout_s
+        self.budget_s = budget_s
+        self.profiler = profiler or PipelineProfiler()
+        self._results: dict[int, dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._deadline = 0.0
+        self._threads: list[threading.Thread] = []
+        self._connections: list[HostConnections] = []
+
+    def start(self) -> SourceProber:
+        self._deadline = time.monotonic() + self.budget_s
+        by_host: dict[str, list[int]] = defaultdict(list)
+        for idx, (_, url) in enumerate(self.sources):
+            by_host[urlsplit(url).hostname or url].append(idx)
+        for host, indexes in by_host.items():
+            connections = HostConnections()
+            worker = threading.Thread(target=self._probe_host, args=(indexes, connections), name=f"probe-{host}")
+            worker.start()
+            self._threads.append(worker)
+            self._connections.append(connections)
+        return self
+
+    def _probe_host(self, indexes: list[int], connections: HostConnections) -> None:
+        try:
+            for idx in indexes:
+                if time.monotonic() >= self._deadline:
+                    return
+                name, url = self.sources[idx]
+                with self.profiler.call("source_probe", stage="sources") as record:
+                    row = probe_url(connections, url, timeout_s=self.timeout_s, deadline=self._deadline)
+                    record.bytes = int(row.get("bytes") or 0)
+                if time.monotonic() > self._deadline:
+                    return  # cut short by the deadline; reported as budget_exceeded
+                row["name"] = name
+                with self._lock:
+                    self._results[idx] = row
+        finally:
+            connections.close()
+
+    def results(self) -> list[dict[str, Any]]:
+        """Wait for the probes (up to the budget) and return rows in source order."""
+        for worker in self._threads:
+            worker.join(max(0.0, self._deadline - time.monotonic()))
+        for connections in self._connections:
+            connections.abort()
+        # I/O is capped at the deadline and aborted above, so this only waits
+        # for a name lookup still in flight, which cannot be interrupted.
+        for worker in self._threads:
+            worker.join()
+        out: list[dict[str, Any]] = []
+        with self._lock:
+            for idx, (name, url) in enumerate(self.sources):
+                row = self._results.get(idx)
+                if row is None:
+                    row = {
+                        "url": url,
+                        "status": 0,
+                        "reachable": False,
+                        "data_accessible": False,
+                        "final_url": url,
+                        "error": "budget_exceeded",
+                        "name": name,
+                    }
+                out.append(row)
+        return out
+
+
+SEGMENT_BITS: dict[str, int] = {segment: 1 << i for i, segment in enumerate(SEARCH_SEGMENTS)}
+QUERY_BITS: dict[str, int] = {
+    query: 1 << i for i, query in enumerate(dict.fromkeys(q for qs in SEARCH_SEGMENTS.values() for q in qs))
+}
+
+
+def _bit_names(mask: int, bits: dict[str, int]) -> list[str]:
+    return sorted(name for name, bit in bits.items() if mask & bit)
+
+
+def _name_bits(names: list[str], bits: dict[str, int]) -> int:
+    mask = 0
+    for name in names:
+        mask |= bits.get(name, 0)
+    return mask
+
+
+@dataclass(slots=True)
+class Candidate:
+    """An app found by discovery, before its metadata is fetched.
+
+    The segments and queries that found it are bitmasks over ``SEGMENT_BITS``
+    and ``QUERY_BITS``, so merging a hit is an OR and a candidate holds a
+    few words instead of two sets of strings. Names decode back to the
+    shared ``SEARCH_SEGMENTS`` strings.
+    """
+
+    package_name: str
+    seed: bool = False
+    segments: int = 0
+    queries: int = 0
+    search_installs: int = 0
+    title_hint: str = ""
+    score_hint: float | None = None
+
+    def segment_names(self) -> list[str]:
+        return _bit_names(self.segments, SEGMENT_BITS)
+
+    def query_names(self) -> list[str]:
+        return _bit_names(self.queries, QUERY_BITS)
+
+    def to_json(self) -> dict[str, Any]:
         return {
-            "url": url,
-            "status": 0,
-            "reachable": False,
-            "data_accessible": False,
-            "final_url": url,
-            "error": f"url_error:{e.reason}",
+            "package_name": self.package_name,
+            "seed": self.seed,
+            "matched_segments": self.segment_names(),
+            "matched_queries": self.query_names(),
+            "search_installs": self.search_installs,
+            "title_hint": self.title_hint,
+            "score_hint": self.score_hint,
         }
-    except Exception as e:  # pragma: no cover
-        return {
-            "url": url,
-            "status": 0,
-            "reachable": False,
-            "data_accessible": False,
-            "final_url": url,
-            "error": f"error:{type(e).__name__}",
+
+    @classmethod
+    def from_json(cls, data: dict[str, Any]) -> Candidate:
+        return cls(
+            package_name=data["package_name"],
+            seed=bool(data.get("seed")),
+            segments=_name_bits(data.get("matched_segments", []), SEGMENT_BITS),
+            queries=_name_bits(data.get("matched_queries", []), QUERY_BITS),
+            search_installs=int(data.get("search_installs") or 0),
+            title_hint=data.get("title_hint", ""),
+            score_hint=data.get("score_hint"),
+        )
+
+
+@dataclass(slots=True)
+class AppRow:
+    """Classified Play metadata of one candidate, as selection reads it.
+
+    Segments and queries stay bitmasks as on ``Candidate``, the description
+    is not kept, and ``text_hits`` is the packed ``build_text_hits`` int. A
+    row whose fetch failed has ``status == "error"`` and only ``error`` set.
+    ``get`` reads a field by name, so the selection helpers take these and
+    plain row dicts alike. ``to_json`` gives the row dict the later stages
+    and the reports use.
+    """
+
+    package_name: str
+    seed: bool = False
+    segments: int = 0
+    queries: int = 0
+    status: str = "ok"
+    error: str | None = None
+    title: str | None = None
+    developer: str | None = None
+    installs: str | None = None
+    installs_count: int | None = None
+    score: float | None = None
+    ratings: int | None = None
+    reviews_total: int | None = None
+    genre: str | None = None
+    summary: str | None = None
+    category: str | None = None
+    relevance: int | None = None
+    text_hits: int | None = None
+
+    METADATA_FIELDS = (
+        "title",
+        "developer",
+        "installs",
+        "installs_count",
+        "score",
+        "ratings",
+        "reviews_total",
+        "genre",
+        "summary",
+    )
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key == "matched_segments":
+            return _bit_names(self.segments, SEGMENT_BITS)
+        if key == "matched_queries":
+            return _bit_names(self.queries, QUERY_BITS)
+        value = getattr(self, key, None) if key in self.__slots__ else None
+        return default if value is None else value
+
+    def to_json(self, text_hits: bool = False) -> dict[str, Any]:
+        """The row dict; ``text_hits=True`` keeps the bitset (for checkpoints)."""
+        data: dict[str, Any] = {
+            "package_name": self.package_name,
+            "status": self.status,
+            "seed": self.seed,
+            "matched_segments": _bit_names(self.segments, SEGMENT_BITS),
+            "matched_queries": _bit_names(self.queries, QUERY_BITS),
         }
+        if self.status != "ok":
+            data["error"] = self.error
+            return data
+        for name in self.METADATA_FIELDS:
+            data[name] = getattr(self, name)
+        if text_hits:
+            data["text_hits"] = self.text_hits
+        data["category"] = self.category
+        data["relevance"] = self.relevance
+        return data
+
+    @classmethod
+    def from_json(cls, data: dict[str, Any]) -> AppRow:
+        row = cls(
+            package_name=data["package_name"],
+            seed=bool(data.get("seed")),
+            segments=_name_bits(data.get("matched_segments", []), SEGMENT_BITS),
+            queries=_name_bits(data.get("matched_queries", []), QUERY_BITS),
+            status=data.get("status", "ok"),
+            error=data.get("error"),
+            category=data.get("category"),
+            relevance=data.get("relevance"),
+        )
+        for name in cls.METADATA_FIELDS:
+            setattr(row, name, data.get(name))
+        if row.status == "ok":
+            row.text_hits = _row_text_hits(data)
+        return row
 
 
 def discover_candidates(
     lang: str,
     country: str,
     hits_per_query: int,
-) -> dict[str, dict[str, Any]]:
-    candidates: dict[str, dict[str, Any]] = {}
+    client: PlayClient | None = None,
+    workers: int = 1,
+    min_query_yield: int = 0,
+    query_stats: list[dict[str, Any]] | None = None,
+) -> dict[str, Candidate]:
+    """Run the ``SEARCH_SEGMENTS`` queries and merge the hits into candidates.
+
+    Segments run concurrently. Queries within a segment run in order, so a
+    segment can stop early: once a query adds fewer than ``min_query_yield``
+    new app ids to its segment, the rest of that segment is skipped (0
+    never skips). Queries that normalize to the same text are searched only
+    once. Hits are merged in the original segment/query order, so when
+    nothing is skipped the candidate map is identical to a serial run.
+
+    Per-query yield is appended to ``query_stats`` when a list is given.
+    """
+    client = client or PlayClient()
+    candidates: dict[str, Candidate] = {}
 
     for app_id in SEED_PACKAGE_IDS:
-        candidates[app_id] = {
-            "package_name": app_id,
-            "matched_segments": set(),
-            "matched_queries": set(),
-            "seed": True,
-            "search_installs": 0,
-        }
+        candidates[app_id] = Candidate(app_id, seed=True)
+
+    searches: dict[str, Future[list[dict[str, Any]]]] = {}
+    searches_lock = threading.Lock()
 
-    for segment, queries in SEARCH_SEGMENTS.items():
+    def search_once(query: str) -> tuple[list[dict[str, Any]], bool]:
+        norm = normalize_text(query)
+        with searches_lock:
+            pending = searches.get(norm)
+            owner = pending is None
+            if owner:
+                pending = searches[norm] = Future()
+        if owner:
+            try:
+                pending.set_result(client.search(norm, lang=lang, country=country, n_hits=hits_per_query))
+            except BaseException as e:
+                pending.set_exception(e)
+        return pending.result(), not owner
+
+    def run_segment(segment: str, queries: list[str]) -> list[dict[str, Any]]:
+        seen = set(SEED_PACKAGE_IDS)
+        results: list[dict[str, Any]] = []
+        skipping = False
         for query in queries:
-            rows = gp_search(query, lang=lang, country=country, n_hits=hits_per_query)  # type: ignore[misc]
-            for item in rows:
+            if skipping:
+                results.append({"segment": segment, "query": query, "rows": [], "skipped": True, "shared": False, "new_in_segment": 0})
+                continue
+            rows, shared = search_once(query)
+            ids = {item.get("appId") for item in rows if item.get("appId")}
+            new_ids = ids - seen
+            seen |= ids
+            results.append(
+                {"segment": segment, "query": query, "rows": rows, "skipped": False, "shared": shared, "new_in_segment": len(new_ids)}
+            )
+            if min_query_yield > 0 and len(new_ids) < min_query_yield:
+                skipping = True
+        return results
+
+    segments = list(SEARCH_SEGMENTS.items())
+    if workers <= 1 or len(segments) <= 1:
+        per_segment = [run_segment(segment, queries) for segment, queries in segments]
+    else:
+        with ThreadPoolExecutor(max_workers=min(workers, len(segments)), thread_name_prefix="gp-search") as pool:
+            per_segment = list(pool.map(lambda item: run_segment(*item), segments))
+
+    for results in per_segment:
+        for result in results:
+            segment, query = result["segment"], result["query"]
+            segment_bit, query_bit = SEGMENT_BITS[segment], QUERY_BITS[query]
+            new_overall = 0
+            for item in result["rows"]:
                 app_id = item.get("appId")
                 if not app_id:
                     continue
-                current = candidates.setdefault(
-                    app_id,
+                current = candidates.get(app_id)
+                if current is None:
+                    current = candidates[app_id] = Candidate(app_id)
+                    new_overall += 1
+                current.segments |= segment_bit
+                current.queries |= query_bit
+                current.title_hint = item.get("title", "")
+                current.score_hint = item.get("score")
+                installs = parse_installs_count(item.get("installs"))
+                if installs > current.search_installs:
+                    current.search_installs = installs
+            if query_stats is not None:
+                query_stats.append(
                     {
-                        "package_name": app_id,
-                        "matched_segments": set(),
-                        "matched_queries": set(),
-                        "seed": False,
-                        "search_installs": 0,
-                    },
+                        "segment": segment,
+                        "query": query,
+                        "hits": len(result["rows"]),
+                        "new_in_segment": result["new_in_segment"],
+                        "new_overall": new_overall,
+                        "shared_search": result["shared"],
+                        "skipped": result["skipped"],
+                    }
                 )
-                current["matched_segments"].add(segment)
-                current["matched_queries"].add(query)
-                current["title_hint"] = item.get("title", "")
-                current["score_hint"] = item.get("score")
-                installs = parse_installs_count(item.get("installs"))
-                if installs > current.get("search_installs", 0):
-                    current["search_installs"] = installs
 
     return candidates
 
 
-def infer_primary_category(meta: dict[str, Any], matched_segments: set[str]) -> str:
-    title_text = normalize_text(str(meta.get("title", "")))
-    text = normalize_text(
-        " ".join(
-            [
-                str(meta.get("title", "")),
-                str(meta.get("summary", "")),
-                str(meta.get("description", ""))[:2000],
-            ]
-        )
+def candidate_priority(cand: Candidate) -> tuple[int, int, int, int]:
+    """Sort key putting the candidates most likely to be selected first.
+
+    Seeds come first, then apps found by more segments and queries, then
+    apps with more search-reported installs.
+    """
+    return (
+        0 if cand.seed else 1,
+        -cand.segments.bit_count(),
+        -cand.queries.bit_count(),
+        -cand.search_installs,
     )
 
-    if any(k in title_text for k in CATEGORY_KEYWORDS["porn_blocker"]) and has_strict_protection_intent(text):
+
+def prefilter_candidates(
+    candidates: dict[str, Candidate],
+    min_installs: int,
+    skipped: list[dict[str, Any]] | None = None,
+) -> dict[str, Candidate]:
+    """Drop candidates that cannot pass the ``select_apps`` installs filter.
+
+    Search hits carry the same install bucket as the app page, so a non-seed
+    candidate whose search-reported bucket stays below ``min_installs`` even
+    one bucket higher (the page may be fresher than a cached search) is not
+    worth a ``gp_app`` call. Seeds and candidates with no reported installs
+    are always kept. Kept candidates stay in their original order. A record
+    per dropped candidate is appended to ``skipped`` when a list is given.
+    """
+    kept: dict[str, Candidate] = {}
+    for app_id, cand in candidates.items():
+        installs = cand.search_installs
+        if not cand.seed and installs > 0 and next_installs_bucket(installs) < min_installs:
+            if skipped is not None:
+                skipped.append(
+                    {
+                        "package_name": app_id,
+                        "title_hint": cand.title_hint,
+                        "search_installs": installs,
+                        "reason": f"search reports {installs:,}+ installs, below --min-installs {min_installs:,}",
+                    }
+                )
+            continue
+        kept[app_id] = cand
+    return kept
+
+
+def _text_views(meta: dict[str, Any]) -> dict[str, str]:
+    """The normalized texts the classifiers read, computed once per app."""
+    head = [str(meta.get("title", "")), str(meta.get("summary", ""))]
+    description = str(meta.get("description", ""))
+    views = {"title": normalize_text(head[0])}
+    for view, limit in TEXT_VIEW_LIMITS.items():
+        views[view] = normalize_text(" ".join(head + [description[:limit]]))
+    return views
+
+
+def build_text_hits(meta: dict[str, Any]) -> int:
+    """``TEXT_MATCHER`` groups found in each view of an app's text, packed in one int.
+
+    Stored on the row as ``text_hits``. The classifiers answer from it with
+    bit tests (see ``TEXT_HIT_BITS``) instead of normalizing and scanning
+    the text again.
+    """
+    views = _text_views(meta)
+    packed = 0
+    for v, mask in enumerate(TEXT_MATCHER.scan([views[view] for view in TEXT_VIEWS])):
+        packed |= mask << (v * len(TEXT_MATCHER.labels))
+    return packed
+
+
+def _row_text_hits(row: Any) -> int:
+    hits = row.get("text_hits")
+    if type(hits) is int:
+        return hits
+    # Rows from elsewhere (an older report, a caller's own dict) are
+    # classified from whatever text they still carry.
+    return build_text_hits(row)
+
+
+def _hit(hits: int, view: str, group: str) -> bool:
+    return bool(hits & TEXT_HIT_BITS[view][group])
+
+
+def infer_primary_category(
+    meta: dict[str, Any],
+    matched_segments: set[str],
+    hits: int | None = None,
+) -> str:
+    hits = build_text_hits(meta) if hits is None else hits
+    strict_intent = _hit(hits, "text_2000", "strict_intent")
+    general_intent = _hit(hits, "text_2000", "general_intent")
+
+    if _hit(hits, "title", "porn_blocker") and strict_intent:
         return "porn_blocker"
 
-    if any(k in title_text for k in CATEGORY_KEYWORDS["gambling_blocker"]) and has_strict_protection_intent(text):
+    if _hit(hits, "title", "gambling_blocker") and strict_intent:
         return "gambling_blocker"
 
-    if any(k in text for k in CATEGORY_KEYWORDS["safe_browser"]):
+    if _hit(hits, "text_2000", "safe_browser"):
         return "safe_browser"
 
-    if any(k in text for k in CATEGORY_KEYWORDS["focus_blocker"]) and has_general_protection_intent(text):
+    if _hit(hits, "text_2000", "focus_blocker") and general_intent:
         return "focus_blocker"
 
-    if "safe_browser" in matched_segments and any(k in text for k in CATEGORY_KEYWORDS["safe_browser"]):
+    if "safe_browser" in matched_segments and _hit(hits, "text_2000", "safe_browser"):
         return "safe_browser"
 
-    if "focus_blocker" in matched_segments and has_general_protection_intent(text):
+    if "focus_blocker" in matched_segments and general_intent:
         return "focus_blocker"
 
     return "other"
 
 
-def relevance_score(meta: dict[str, Any], matched_segments: set[str]) -> int:
-    text = normalize_text(
-        " ".join(
-            [
-                str(meta.get("title", "")),
-                str(meta.get("summary", "")),
-                str(meta.get("description", ""))[:1200],
-            ]
-        )
-    )
+def relevance_score(
+    meta: dict[str, Any],
+    matched_segments: set[str],
+    hits: int | None = None,
+) -> int:
+    hits = build_text_hits(meta) if hits is None else hits
     score = 0
     if matched_segments:
         score += 3
-    score += sum(1 for cat in CATEGORY_KEYWORDS.values() if any(k in text for k in cat))
-    if "block" in text:
+    score += sum(1 for cat in CATEGORY_KEYWORDS if _hit(hits, "text_1200", cat))
+    if _hit(hits, "text_1200", "block"):
         score += 2
-    if "porn" in text or "gambling" in text:
+    if _hit(hits, "text_1200", "porn_or_gambling"):
         score += 3
     return score
 
 
-def row_text(row: dict[str, Any]) -> str:
-    return normalize_text(
-        " ".join(
-            [
-                str(row.get("title", "")),
-                str(row.get("summary", "")),
-                str(row.get("description", ""))[:1600],
-            ]
-        )
-    )
-
-
-def has_strict_protection_intent(text: str) -> bool:
-    return any(k in text for k in STRICT_PROTECTION_INTENT_KEYWORDS)
-
-
-def has_general_protection_intent(text: str) -> bool:
-    return any(k in text for k in GENERAL_INTENT_KEYWORDS)
-
-
-def is_relevant_row(row: dict[str, Any]) -> bool:
+def is_relevant_row(row: AppRow | dict[str, Any]) -> bool:
     cat = str(row.get("category", "other"))
-    title_text = normalize_text(str(row.get("title", "")))
-    text = row_text(row)
+    hits = _row_text_hits(row)
+    strict_intent = _hit(hits, "text_1600", "strict_intent")
 
-    if cat in {"porn_blocker", "gambling_blocker"} and not has_strict_protection_intent(text):
+    if cat in {"porn_blocker", "gambling_blocker"} and not strict_intent:
         return False
 
-    if cat == "porn_blocker" and not any(k in title_text for k in CATEGORY_KEYWORDS["porn_blocker"]):
+    if cat == "porn_blocker" and not _hit(hits, "title", "porn_blocker"):
         return False
 
     if cat == "gambling_blocker":
-        if not any(k in title_text for k in CATEGORY_KEYWORDS["gambling_blocker"]):
+        if not _hit(hits, "title", "gambling_blocker"):
             return False
-        has_operator = any(k in text for k in GAMBLING_OPERATOR_KEYWORDS)
-        if has_operator and not has_strict_protection_intent(text):
+        has_operator = _hit(hits, "text_1600", "gambling_operator")
+        if has_operator and not strict_intent:
             return False
 
-    if "vpn" in text and cat in {"porn_blocker", "gambling_blocker"} and "block" not in text:
+    if _hit(hits, "text_1600", "vpn") and cat in {"porn_blocker", "gambling_blocker"} and not _hit(hits, "text_1600", "block"):
         return False
 
     return True
 
 
+def fetch_app_row(
+    app_id: str,
+    cand: Candidate,
+    lang: str,
+    country: str,
+    client: PlayClient | None = None,
+) -> AppRow:
+    """Metadata row of one candidate, classified.
+
+    The description is only read for classification (``text_hits``,
+    ``category``, ``relevance``) and is not kept on the row.
+    """
+    client = client or PlayClient()
+    row = AppRow(app_id, seed=cand.seed, segments=cand.segments, queries=cand.queries)
+    try:
+        meta = client.app(app_id, lang=lang, country=country)
+        title = meta.get("title", app_id)
+        developer = meta.get("developer", "")
+        installs = meta.get("installs", "0")
+        installs_count = parse_installs_count(meta.get("installs"))
+        genre = meta.get("genre", "")
+        summary = meta.get("summary", "")
+        matched_segments = set(cand.segment_names())
+        hits = build_text_hits(meta)
+        category = infer_primary_category(meta, matched_segments, hits)
+        relevance = relevance_score(meta, matched_segments, hits)
+    except Exception as e:
+        row.status = "error"
+        row.error = f"{type(e).__name__}: {e}"
+        return row
+    row.title, row.developer, row.installs, row.installs_count = title, developer, installs, installs_count
+    row.score, row.ratings, row.reviews_total = meta.get("score"), meta.get("ratings"), meta.get("reviews")
+    row.genre, row.summary = genre, summary
+    row.text_hits, row.category, row.relevance = hits, category, relevance
+    return row
+
+
 def fetch_metadata_for_candidates(
-    candidates: dict[str, dict[str, Any]],
+    candidates: dict[str, Candidate],
     lang: str,
     country: str,
-) -> list[dict[str, Any]]:
-    rows: list[dict[str, Any]] = []
+    workers: int = 1,
+    client: PlayClient | None = None,
+) -> list[AppRow]:
+    """Fetch Play metadata for every candidate.
 
-    for app_id, cand in candidates.items():
-        row: dict[str, Any] = {
-            "package_name": app_id,
-            "status": "ok",
-            "seed": bool(cand.get("seed")),
-            "matched_segments": sorted(list(cand.get("matched_segments", set()))),
-            "matched_queries": sorted(list(cand.get("matched_queries", set()))),
-        }
-        try:
-            meta = gp_app(app_id, lang=lang, country=country)  # type: ignore[misc]
-            row["title"] = meta.get("title", app_id)
-            row["developer"] = meta.get("developer", "")
-            row["installs"] = meta.get("installs", "0")
-            row["installs_count"] = parse_installs_count(meta.get("installs"))
-            row["score"] = meta.get("score")
-            row["ratings"] = meta.get("ratings")
-            row["reviews_total"] = meta.get("reviews")
-            row["genre"] = meta.get("genre", "")
-            row["summary"] = meta.get("summary", "")
-            row["description"] = meta.get("description", "")
-            matched_segments = set(row["matched_segments"])
-            row["category"] = infer_primary_category(meta, matched_segments)
-            row["relevance"] = relevance_score(meta, matched_segments)
-        except Exception as e:
-            row["status"] = "error"
-            row["error"] = f"{type(e).__name__}: {e}"
-        rows.append(row)
+    Calls are issued in ``candidate_priority`` order, so when Play starts
+    throttling or failing partway the likeliest picks are already fetched.
+    With ``workers > 1`` the blocking ``gp_app`` calls run on a bounded thread
+    pool. Rows always come back in candidate order, whatever the fetch or
+    completion order was.
+    """
+    items = list(candidates.items())
+    order = sorted(range(len(items)), key=lambda i: candidate_priority(items[i][1]))
+
+    def fetch_one(index: int) -> AppRow:
+        app_id, cand = items[index]
+        return fetch_app_row(app_id, cand, lang=lang, country=country, client=client)
 
+    if workers <= 1 or len(items) <= 1:
+        fetched = [fetch_one(i) for i in order]
+    else:
+        with ThreadPoolExecutor(max_workers=min(workers, len(items)), thread_name_prefix="gp-app") as pool:
+            fetched = list(pool.map(fetch_one, order))
+
+    rows = list(fetched)
+    for index, row in zip(order, fetched):
+        rows[index] = row
     return rows
 
 
+def _selection_key(row: AppRow | dict[str, Any]) -> tuple[int, float, int]:
+    """Ascending key for "most installs, then best score, then most ratings"."""
+    return (
+        -int(row.get("installs_count") or 0),
+        -float(row.get("score") or 0.0),
+        -int(row.get("ratings") or 0),
+    )
+
+
 def select_apps(
-    rows: list[dict[str, Any]],
+    rows: list[Any],
     max_apps: int,
     min_installs: int,
-) -> list[dict[str, Any]]:
-    ok = [
-        r
-        for r in rows
-        if r.get("status") == "ok"
-        and int(r.get("installs_count") or 0) >= min_installs
-        and int(r.get("relevance") or 0) >= 2
-        and is_relevant_row(r)
-        and r.get("category") in {"porn_blocker", "gambling_blocker", "focus_blocker", "safe_browser"}
-    ]
-
-    ok.sort(
-        key=lambda r: (
-            int(r.get("installs_count") or 0),
-            float(r.get("score") or 0.0),
-            int(r.get("ratings") or 0),
-        ),
-        reverse=True,
-    )
+    category_caps: dict[str, int] | None = None,
+) -> list[Any]:
+    """Pick the biggest relevant apps, up to a cap per category.
 
-    target_by_category = {
-        "porn_blocker": 5,
-        "gambling_blocker": 5,
-        "focus_blocker": 6,
-        "safe_browser": 3,
-    }
+    Categories are filled in ``category_caps`` order (``DEFAULT_CATEGORY_CAPS``
+    when not given), each with its top apps by installs, score and ratings.
+    Ties keep input order, and a package already picked for an earlier
+    category is skipped. Eligible rows are bucketed by category in one pass,
+    and only each bucket's top ``cap`` rows are ranked (``heapq.nsmallest``),
+    so the cost is O(n log cap) rather than a full sort.
+    """
+    caps = DEFAULT_CATEGORY_CAPS if category_caps is None else category_caps
+    buckets: dict[str, list[Any]] = defaultdict(list)
+    for r in rows:
+        cat = r.get("category")
+        if (
+            cat in caps
+            and r.get("status") == "ok"
+            and int(r.get("installs_count") or 0) >= min_installs
+            and int(r.get("relevance") or 0) >= 2
+            and is_relevant_row(r)
+        ):
+            buckets[cat].append(r)
 
-    selected: list[dict[str, Any]] = []
+    selected: list[Any] = []
     used: set[str] = set()
-    selected_by_cat: dict[str, int] = defaultdict(int)
-
-    for cat, needed in target_by_category.items():
-        picks = [r for r in ok if r.get("category") == cat and r.get("package_name") not in used][:needed]
-        for p in picks:
-            used.add(str(p.get("package_name")))
-            selected.append(p)
-            selected_by_cat[cat] += 1
-
-    for r in ok:
-        pkg = str(r.get("package_name"))
-        if pkg in used:
-            continue
-        cat = str(r.get("category"))
-        cap = target_by_category.get(cat, 3)
-        if selected_by_cat.get(cat, 0) >= cap:
-            continue
-        selected.append(r)
-        used.add(pkg)
-        selected_by_cat[cat] = selected_by_cat.get(cat, 0) + 1
+    for cat, needed in caps.items():
         if len(selected) >= max_apps:
             break
+        bucket = buckets.get(cat, [])
+        depth = needed
+        while True:
+            top = heapq.nsmallest(depth, bucket, key=_selection_key)
+            picks = [r for r in top if r.get("package_name") not in used][:needed]
+            # Packages taken by earlier categories can leave the top rows short;
+            # look deeper until the cap is met or the bucket runs out.
+            if len(picks) >= needed or len(top) >= len(bucket):
+                break
+            depth = 2 * depth + len(used)
+        used.update(str(p.get("package_name")) for p in picks)
+        selected.extend(picks)
 
     return selected[:max_apps]
 
 
+class ReviewStore:
+    """Local SQLite history of reviews per (package, lang, country).
+
+    Only the fields the analysis needs are kept. Because rows are unique by
+    review id, repeated syncs never duplicate a review.
+    """
+
+    def __init__(self, path: Path) -> None:
+        import sqlite3
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False, timeout=30, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS reviews ("
+            "package TEXT NOT NULL, lang TEXT NOT NULL, country TEXT NOT NULL, review_id TEXT NOT NULL, "
+            "at REAL NOT NULL, score INTEGER NOT NULL, user_name TEXT NOT NULL, content TEXT NOT NULL, "
+            "PRIMARY KEY (package, lang, country, review_id))"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS reviews_newest ON reviews(package, lang, country, at DESC)")
+
+    def watermark(self, package_name: str, lang: str, country: str) -> float | None:
+        """Timestamp of the newest stored review, or None when nothing is stored."""
+        with self._lock:
+            found = self._conn.execute(
+                "SELECT MAX(at) FROM reviews WHERE package = ? AND lang = ? AND country = ?",
+                (package_name, lang, country),
+            ).fetchone()
+        return None if found is None or found[0] is None else float(found[0])
+
+    def known_ids(self, package_name: str, lang: str, country: str, review_ids: list[str]) -> set[str]:
+        if not review_ids:
+            return set()
+        marks = ",".join("?" for _ in review_ids)
+        with self._lock:
+            found = self._conn.execute(
+                f"SELECT review_id FROM reviews WHERE package = ? AND lang = ? AND country = ? AND review_id IN ({marks})",
+                (package_name, lang, country, *review_ids),
+            ).fetchall()
+        return {r[0] for r in found}
+
+    def add(self, package_name: str, lang: str, country: str, items: list[dict[str, Any]]) -> None:
+        records = [
+            (
+                package_name,
+                lang,
+                country,
+                str(item.get("reviewId")),
+                _review_epoch(item.get("at")),
+                int(item.get("score", 0) or 0),
+                str(item.get("userName") or ""),
+                str(item.get("content") or ""),
+            )
+            for item in items
+            if item.get("reviewId")
+        ]
+        with self._lock:
+            self._conn.executemany("INSERT OR IGNORE INTO reviews VALUES (?, ?, ?, ?, ?, ?, ?, ?)", records)
+
+    def load(self, package_name: str, lang: str, country: str, limit: int = 0) -> list[dict[str, Any]]:
+        """Stored reviews, newest first; ``limit`` <= 0 returns the whole history."""
+        query = (
+            "SELECT review_id, at, score, user_name, content FROM reviews "
+            "WHERE package = ? AND lang = ? AND country = ? ORDER BY at DESC, review_id"
+        )
+        params: tuple[Any, ...] = (package_name, lang, country)
+        if limit > 0:
+            query += " LIMIT ?"
+            params += (limit,)
+        with self._lock:
+            found = self._conn.execute(query, params).fetchall()
+        return [
+            {
+                "reviewId": review_id,
+                "at": datetime.fromtimestamp(at),
+                "score": score,
+                "userName": user_name,
+                "content": content,
+            }
+            for review_id, at, score, user_name, content in found
+        ]
+
+    def columns(
+        self,
+        packages: list[str],
+        lang: str,
+        country: str,
+        limit: int = 0,
+    ) -> tuple[array, array, list[str]]:
+        """Stored reviews of ``packages`` as columns: (package index, score, normalized text).
+
+        ``limit`` > 0 keeps only the newest ``limit`` reviews per package.
+        Rows stream from the cursor, so no per-review dicts are built.
+        """
+        codes = array("i")
+        scores = array("b")
+        texts: list[str] = []
+        if not packages:
+            return codes, scores, texts
+        index = {pkg: i for i, pkg in enumerate(packages)}
+        marks = ",".join("?" for _ in packages)
+        query = (
+            "SELECT package, score, content FROM ("
+            "SELECT package, score, content, ROW_NUMBER() OVER "
+            "(PARTITION BY package ORDER BY at DESC, review_id) AS rank "
+            f"FROM reviews WHERE lang = ? AND country = ? AND package IN ({marks}))"
+        )
+        params: tuple[Any, ...] = (lang, country, *packages)
+        if limit > 0:
+            query += " WHERE rank <= ?"
+            params += (limit,)
+        with self._lock:
+            for package_name, score, content in self._conn.execute(query, params):
+                codes.append(index[package_name])
+                scores.append(int(score))
+                texts.append(normalize_text(content))
+        return codes, scores, texts
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def _review_epoch(value: Any) -> float:
+    if isinstance(value, datetime):
+        return value.timestamp()
+    try:
+        return float(value or 0.0)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+class SignalHistory:
+    """Append-only SQLite history of per-run, per-app review signals and metadata.
+
+    Every run adds one ``runs`` row plus a snapshot (category, installs, score,
+    ratings, reviews sampled) and exact signal hit counts for each selected
+    app. Package, category and signal names are interned to integer ids, and
+    the fact tables are ``WITHOUT ROWID`` tables clustered on their keys. A
+    year of daily runs stays in the low megabytes, and "last N runs" queries
+    read only index ranges.
+    """
+
+    def __init__(self, path: Path) -> None:
+        import sqlite3
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False, timeout=30, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS runs (
+                run_id INTEGER PRIMARY KEY, generated_at TEXT NOT NULL, country TEXT NOT NULL, lang TEXT NOT NULL);
+            CREATE INDEX IF NOT EXISTS runs_market ON runs(country, lang, generated_at);
+            CREATE TABLE IF NOT EXISTS names (
+                name_id INTEGER PRIMARY KEY, kind TEXT NOT NULL, name TEXT NOT NULL, UNIQUE (kind, name));
+            CREATE TABLE IF NOT EXISTS snapshots (
+                run_id INTEGER NOT NULL, app_id INTEGER NOT NULL, category_id INTEGER NOT NULL,
+                installs INTEGER NOT NULL, score REAL, ratings INTEGER, reviews INTEGER NOT NULL,
+                PRIMARY KEY (run_id, app_id)) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS snapshots_app ON snapshots(app_id, run_id);
+            CREATE TABLE IF NOT EXISTS signal_counts (
+                run_id INTEGER NOT NULL, app_id INTEGER NOT NULL, signal_id INTEGER NOT NULL, hits INTEGER NOT NULL,
+                PRIMARY KEY (run_id, app_id, signal_id)) WITHOUT ROWID;
+            """
+        )
+
+    def _name_id(self, kind: str, name: str) -> int:
+        self._conn.execute("INSERT OR IGNORE INTO names (kind, name) VALUES (?, ?)", (kind, name))
+        return int(
+            self._conn.execute("SELECT name_id FROM names WHERE kind = ? AND name = ?", (kind, name)).fetchone()[0]
+        )
+
+    def record_run(self, generated_at: str, country: str, lang: str, rows: list[dict[str, Any]]) -> int:
+        """Append one run's selected apps; returns the new run id."""
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                run_id = int(
+                    self._conn.execute(
+                        "INSERT INTO runs (generated_at, country, lang) VALUES (?, ?, ?)",
+                        (generated_at, country, lang),
+                    ).lastrowid
+                )
+                for row in rows:
+                    app_id = self._name_id("package", str(row.get("package_name")))
+                    signals = row.get("review_signals") or {}
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO snapshots VALUES (?, ?, ?, ?, ?, ?, ?)",
+                        (
+                            run_id,
+                            app_id,
+                            self._name_id("category", str(row.get("category", "other"))),
+                            int(row.get("installs_count") or 0),
+                            row.get("score"),
+                            row.get("ratings"),
+                            int(signals.get("total_reviews") or 0),
+                        ),
+                    )
+                    self._conn.executemany(
+                        "INSERT OR REPLACE INTO signal_counts VALUES (?, ?, ?, ?)",
+                        [
+                            (run_id, app_id, self._name_id("signal", label), int(hits))
+                            for label, hits in (signals.get("signal_counts") or {}).items()
+                        ],
+                    )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return run_id
+
+    def recent_runs(self, country: str, lang: str, last_runs: int) -> list[tuple[int, str]]:
+        """(run_id, generated_at) of the newest ``last_runs`` runs of a market, oldest first."""
+        with self._lock:
+            found = self._conn.execute(
+                "SELECT run_id, generated_at FROM runs WHERE country = ? AND lang = ? "
+                "ORDER BY generated_at DESC, run_id DESC LIMIT ?",
+                (country, lang, last_runs),
+            ).fetchall()
+        return [(int(run_id), str(at)) for run_id, at in reversed(found)]
+
+    def signal_trend(
+        self,
+        country: str,
+        lang: str,
+        last_runs: int,
+        signal: str | None = None,
+        category: str | None = None,
+    ) -> list[dict[str, Any]]:
+        """Signal hit rates per run and category over a market's newest runs.
+
+        ``signal`` and ``category`` narrow the result, e.g. "bypass for
+        porn_blocker over the last 30 runs". Rows are ordered by run, then
+        category and signal.
+        """
+        runs = self.recent_runs(country, lang, last_runs)
+        if not runs:
+            return []
+        marks = ",".join("?" for _ in runs)
+        query = (
+            "SELECT s.run_id, cat.name, sig.name, SUM(c.hits), SUM(s.reviews) "
+            "FROM snapshots s "
+            "JOIN signal_counts c ON c.run_id = s.run_id AND c.app_id = s.app_id "
+            "JOIN names cat ON cat.name_id = s.category_id "
+            "JOIN names sig ON sig.name_id = c.signal_id "
+            f"WHERE s.run_id IN ({marks})"
+        )
+        params: list[Any] = [run_id for run_id, _ in runs]
+        if signal is not None:
+            query += " AND sig.name = ?"
+            params.append(signal)
+        if category is not None:
+            query += " AND cat.name = ?"
+            params.append(category)
+        query += " GROUP BY s.run_id, cat.name, sig.name ORDER BY s.run_id, cat.name, sig.name"
+        generated = dict(runs)
+        with self._lock:
+            found = self._conn.execute(query, params).fetchall()
+        return [
+            {
+                "run_id": run_id,
+                "generated_at": generated[run_id],
+                "category": cat,
+                "signal": sig,
+                "reviews": int(reviews),
+                "hits": int(hits),
+                "pct": safe_pct(int(hits), int(reviews)),
+            }
+            for run_id, cat, sig, hits, reviews in found
+        ]
+
+    def app_snapshots(self, run_ids: list[int]) -> dict[int, dict[str, dict[str, Any]]]:
+        """Metadata snapshots of the given runs: ``{run_id: {package: snapshot}}``."""
+        out: dict[int, dict[str, dict[str, Any]]] = {run_id: {} for run_id in run_ids}
+        if not run_ids:
+            return out
+        marks = ",".join("?" for _ in run_ids)
+        with self._lock:
+            found = self._conn.execute(
+                "SELECT s.run_id, pkg.name, cat.name, s.installs, s.score, s.ratings, s.reviews FROM snapshots s "
+                "JOIN names pkg ON pkg.name_id = s.app_id JOIN names cat ON cat.name_id = s.category_id "
+                f"WHERE s.run_id IN ({marks})",
+                run_ids,
+            ).fetchall()
+        for run_id, pkg, cat, installs, score, ratings, reviews in found:
+            out[run_id][pkg] = {
+                "category": cat,
+                "installs_count": installs,
+                "score": score,
+                "ratings": ratings,
+                "reviews": reviews,
+            }
+        return out
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def history_deltas(history: SignalHistory, country: str, lang: str, trend_runs: int = 8) -> dict[str, Any]:
+    """Changes between a market's two newest recorded runs, plus short signal trends."""
+    runs = history.recent_runs(country, lang, trend_runs)
+    out: dict[str, Any] = {"runs_recorded": len(runs), "previous_generated_at": None, "signals": [], "apps": []}
+    if len(runs) < 2:
+        return out
+    (prev_id, prev_at), (cur_id, _) = runs[-2], runs[-1]
+    out["previous_generated_at"] = prev_at
+
+    series: dict[tuple[str, str], dict[int, float]] = defaultdict(dict)
+    for point in history.signal_trend(country, lang, trend_runs):
+        if point["signal"] in ROLLUP_SIGNALS:
+            series[(point["category"], point["signal"])][point["run_id"]] = point["pct"]
+    for (category, signal), by_run in sorted(
+        series.items(),
+        key=lambda kv: (
+            CATEGORY_PRIORITY.index(kv[0][0]) if kv[0][0] in CATEGORY_PRIORITY else 99,
+            ROLLUP_SIGNALS.index(kv[0][1]),
+        ),
+    ):
+        if cur_id not in by_run:
+            continue
+        previous = by_run.get(prev_id)
+        out["signals"].append(
+            {
+                "category": category,
+                "signal": signal,
+                "previous_pct": previous,
+                "current_pct": by_run[cur_id],
+                "delta_pts": None if previous is None else round(by_run[cur_id] - previous, 1),
+                "trend": [by_run[run_id] for run_id, _ in runs if run_id in by_run],
+            }
+        )
+
+    snapshots = history.app_snapshots([prev_id, cur_id])
+    before, after = snapshots[prev_id], snapshots[cur_id]
+    for pkg in sorted(set(before) | set(after)):
+        old, new = before.get(pkg), after.get(pkg)
+        change: dict[str, Any] = {"package_name": pkg}
+        if old is None:
+            change["status"] = "new"
+        elif new is None:
+            change["status"] = "dropped"
+        else:
+            change["status"] = "kept"
+            change["installs_delta"] = int(new["installs_count"]) - int(old["installs_count"])
+            change["score_delta"] = (
+                None if new["score"] is None or old["score"] is None else round(new["score"] - old["score"], 2)
+            )
+            change["ratings_delta"] = (
+                None if new["ratings"] is None or old["ratings"] is None else int(new["ratings"]) - int(old["ratings"])
+            )
+            if not change["installs_delta"] and not change["score_delta"] and not change["ratings_delta"]:
+                continue
+        out["apps"].append(change)
+    return out
+
+
+def review_key(item: dict[str, Any]) -> str:
+    """Identity of a review: its id, or a hash of (user, timestamp, content) without one."""
+    review_id = item.get("reviewId")
+    if review_id:
+        return str(review_id)
+    raw = "\0".join((str(item.get("userName") or ""), str(_review_epoch(item.get("at"))), str(item.get("content") or "")))
+    return "h:" + hashlib.sha1(raw.encode("utf-8", "surrogatepass")).hexdigest()
+
+
+class SeenReviews:
+    """Persistent set of 64-bit review fingerprints, for overlap across runs.
+
+    A fingerprint is a hash of (package, lang, country, ``review_key``).
+    Fingerprints live in two sorted ``array("Q")`` generations, at 8 bytes
+    per review, and are looked up by binary search. Every review seen in
+    this run, new or repeated, is merged into the newer generation on
+    ``save``. When that would take it past half of ``max_entries``, the
+    newer generation becomes the older one instead, the previous older
+    generation is dropped, and this run's reviews start a new generation.
+    A review seen in a run is therefore remembered for at least the next
+    rotation. Memory stays under about
+    ``8 * max_entries`` bytes (unless one run alone sees more than half of
+    that), at the price of forgetting reviews not seen again during a whole
+    generation.
+    """
+
+    MAGIC = b"MSSEEN1\n"
+
+    def __init__(self, path: Path, max_entries: int = 4_000_000) -> None:
+        self.path = path
+        self.max_entries = max(2, max_entries)
+        self._lock = threading.Lock()
+        self._older = array("Q")
+        self._newer = array("Q")
+        self._fresh: set[int] = set()
+        if path.exists():
+            with path.open("rb") as fh:
+                if fh.read(len(self.MAGIC)) == self.MAGIC:
+                    sizes = array("Q")
+                    sizes.fromfile(fh, 2)
+                    self._older.fromfile(fh, sizes[0])
+                    self._newer.fromfile(fh, sizes[1])
+
+    @staticmethod
+    def fingerprint(package_name: str, lang: str, country: str, key: str) -> int:
+        raw = f"{package_name}\0{lang}\0{country}\0{key}".encode("utf-8", "surrogatepass")
+        return int.from_bytes(hashlib.blake2b(raw, digest_size=8).digest(), "little")
+
+    @staticmethod
+    def _contains(generation: array, fp: int) -> bool:
+        idx = bisect.bisect_left(generation, fp)
+        return idx < len(generation) and generation[idx] == fp
+
+    def observe(self, package_name: str, lang: str, country: str, items: list[dict[str, Any]]) -> int:
+        """Remember ``items``; returns how many were already seen in earlier runs."""
+        return self.observe_fingerprints(
+            [self.fingerprint(package_name, lang, country, review_key(item)) for item in items]
+        )
+
+    def observe_fingerprints(self, fps: list[int] | array) -> int:
+        """``observe`` for precomputed fingerprints."""
+        overlap = 0
+        with self._lock:
+            for fp in fps:
+                if self._contains(self._newer, fp) or self._contains(self._older, fp):
+                    overlap += 1
+                # Repeats are kept too, so they are promoted on save.
+                self._fresh.add(fp)
+        return overlap
+
+    def __len__(self) -> int:
+        return len(self._older) + len(self._newer) + len(self._fresh)
+
+    def save(self) -> None:
+        with self._lock:
+            fresh = sorted(self._fresh)
+            added = [fp for fp in fresh if not self._contains(self._newer, fp)]
+            # Rotate before merging, so this run's reviews always land in the
+            # newer generation and survive the next rotation.
+            if len(self._newer) + len(added) > self.max_entries // 2:
+                older, newer = self._newer, array("Q", fresh)
+            else:
+                older, newer = self._older, array("Q", heapq.merge(self._newer, added))
+            self._older, self._newer, self._fresh = older, newer, set()
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            atomic_write_bytes(
+                self.path,
+                self.MAGIC + array("Q", [len(older), len(newer)]).tobytes() + older.tobytes() + newer.tobytes(),
+            )
+
+
+def iter_review_pages(
+    package_name: str,
+    lang: str,
+    country: str,
+    target_count: int,
+    client: PlayClient | None = None,
+    stats: dict[str, int] | None = None,
+) -> Iterator[list[dict[str, Any]]]:
+    """Newest ``target_count`` distinct reviews, one page at a time.
+
+    Reviews repeated across pages are dropped by ``review_key``, and their
+    number is added to ``stats["duplicates"]`` when ``stats`` is given (once
+    paging ends). Only the key of each yielded review is kept, so a consumer
+    that drops pages as it goes holds one page of records.
+    """
+    client = client or PlayClient()
+    seen: set[str] = set()
+    duplicates = 0
+    continuation_token = None
+
+    try:
+        while len(seen) < target_count:
+            batch_count = min(200, target_count - len(seen))
+            batch, continuation_token = client.reviews_page(
+                package_name,
+                lang=lang,
+                country=country,
+                count=batch_count,
+                continuation_token=continuation_token,
+            )
+            if not batch:
+                break
+            page: list[dict[str, Any]] = []
+            for item in batch:
+                key = review_key(item)
+                if key in seen:
+                    duplicates += 1
+                    continue
+                seen.add(key)
+                page.append(item)
+            if page:
+                yield page
+            # A page of nothing but repeats means paging is going in circles.
+            if continuation_token is None or not page:
+                break
+    finally:
+        if stats is not None:
+            stats["duplicates"] = stats.get("duplicates", 0) + duplicates
+
+
 def collect_reviews(
     package_name: str,
     lang: str,
     country: str,
     target_count: int,
+    client: PlayClient | None = None,
+    stats: dict[str, int] | None = None,
 ) -> list[dict[str, Any]]:
-    items: list[dict[str, Any]] = []
+    """Newest ``target_count`` distinct reviews as one list (see ``iter_review_pages``)."""
+    return [item for page in iter_review_pages(package_name, lang, country, target_count, client, stats) for item in page]
+
+
+def sync_reviews(
+    package_name: str,
+    lang: str,
+    country: str,
+    store: ReviewStore,
+    max_new: int,
+    client: PlayClient | None = None,
+    stats: dict[str, int] | None = None,
+    probe_page: int = 20,
+) -> int:
+    """Fetch only reviews newer than what ``store`` already holds.
+
+    Newest-first pages are read until a review id that is already stored,
+    or one older than the stored watermark, shows up. Returns the number of
+    new reviews stored. Repeats within the fetched pages are dropped and
+    counted in ``stats["duplicates"]`` like in ``collect_reviews``.
+
+    When the store already has reviews for the app, the first page asks for
+    only ``probe_page`` reviews, since a steady-state sync usually finds a
+    handful of new ones. The page size doubles (up to 200) only while every
+    review on a page is new.
+    """
+    client = client or PlayClient()
+    watermark = store.watermark(package_name, lang, country)
+    fresh: list[dict[str, Any]] = []
+    fresh_keys: set[str] = set()
+    duplicates = 0
     continuation_token = None
+    page_size = 200 if watermark is None else max(1, probe_page)
 
-    while len(items) < target_count:
-        batch_count = min(200, target_count - len(items))
-        batch, continuation_token = gp_reviews(  # type: ignore[misc]
+    while len(fresh) < max_new:
+        batch, continuation_token = client.reviews_page(
             package_name,
             lang=lang,
             country=country,
-            sort=Sort.NEWEST,  # type: ignore[union-attr]
-            count=batch_count,
+            count=min(page_size, max_new - len(fresh)),
             continuation_token=continuation_token,
         )
         if not batch:
             break
-        items.extend(batch)
-        if continuation_token is None:
+        known = store.known_ids(package_name, lang, country, [str(r.get("reviewId")) for r in batch if r.get("reviewId")])
+        caught_up = False
+        before = len(fresh)
+        for item in batch:
+            if str(item.get("reviewId")) in known or (
+                watermark is not None and _review_epoch(item.get("at")) < watermark
+            ):
+                caught_up = True
+                break
+            key = review_key(item)
+            if key in fresh_keys:
+                duplicates += 1
+                continue
+            fresh_keys.add(key)
+            fresh.append(item)
+        if caught_up or continuation_token is None or len(fresh) == before:
             break
+        page_size = min(200, page_size * 2)
 
-    return items
+    if stats is not None:
+        stats["duplicates"] = stats.get("duplicates", 0) + duplicates
+    store.add(package_name, lang, country, fresh[:max_new])
+    return min(len(fresh), max_new)
 
 
-def analyze_review_signals(review_items: list[dict[str, Any]]) -> dict[str, Any]:
-    total = len(review_items)
-    counts = {k: 0 for k in SIGNALS}
+def _count_review_signals(review_items: list[dict[str, Any]]) -> tuple[int, int, list[int]]:
+    """Low-star, high-star and per-signal counts (in ``SIGNAL_MATCHER.labels`` order)."""
     low_star = 0
     high_star = 0
+    texts: list[str] = []
 
     for row in review_items:
-        text = normalize_text(str(row.get("content", "")))
+        texts.append(normalize_text(str(row.get("content", ""))))
         score = int(row.get("score", 0) or 0)
         if score <= 2:
             low_star += 1
         if score >= 4:
             high_star += 1
-        for signal, keywords in SIGNALS.items():
-            if any(keyword in text for keyword in keywords):
-                counts[signal] += 1
 
-    return {
-        "total_reviews": total,
-        "low_star_pct": safe_pct(low_star, total),
-        "high_star_pct": safe_pct(high_star, total),
-        "signal_pct": {k: safe_pct(v, total) for k, v in counts.items()},
-    }
+    return low_star, high_star, list(SIGNAL_MATCHER.count(texts).values())
+
+
+class ReviewSignalTally:
+    """Running ``analyze_review_signals`` counters, fed a page of reviews at a time.
+
+    Without a pool each page is counted as it arrives and nothing is kept.
+    With an ``AnalysisPool``, each page is packed and queued to the workers
+    as it arrives, and counting overlaps with fetching the next page. At
+    most one packed page per worker waits in the pool; adding another first
+    merges the oldest result, so memory stays around a page whatever the
+    sample size. Inputs big enough to shard are counted across the workers
+    at once. Counts add up exactly, so the result is the same however the
+    reviews were paged. ``total`` counts analyzed reviews and ``sampled``
+    adds the queued ones.
+    """
+
+    def __init__(self, pool: AnalysisPool | None = None) -> None:
+        self.pool = pool
+        self.total = 0
+        self.low_star = 0
+        self.high_star = 0
+        self.counts = [0] * len(SIGNAL_MATCHER.labels)
+        self._pending: deque[tuple[Future[tuple[int, int, list[int]]], int]] = deque()
+        self._pending_reviews = 0
+
+    def add(self, review_items: list[dict[str, Any]]) -> None:
+        if self.pool is None:
+            self._merge(_count_review_signals(review_items), len(review_items))
+            return
+        if self.pool.wants(len(review_items)):
+            self._merge(self.pool.review_counts(review_items), len(review_items))
+            return
+        if not review_items:
+            return
+        self._pending.append((self.pool.submit_counts(review_items), len(review_items)))
+        self._pending_reviews += len(review_items)
+        while len(self._pending) > self.pool.workers:
+            self._collect()
+
+    def _collect(self) -> None:
+        future, count = self._pending.popleft()
+        self._pending_reviews -= count
+        self._merge(future.result(), count)
+
+    def _flush(self) -> None:
+        while self._pending:
+            self._collect()
+
+    def _merge(self, part: tuple[int, int, list[int]], count: int) -> None:
+        low, high, counts = part
+        self.total += count
+        self.low_star += low
+        self.high_star += high
+        self.counts = [a + b for a, b in zip(self.counts, counts)]
+
+    @property
+    def sampled(self) -> int:
+        return self.total + self._pending_reviews
+
+    def ci_width_pct(self) -> float:
+        """``signal_ci_width_pct`` of the reviews analyzed so far (pending ones are not forced through)."""
+        return signal_ci_width_pct(self.counts, self.total)
+
+    def result(self) -> dict[str, Any]:
+        self._flush()
+        total = self.total
+        return {
+            "total_reviews": total,
+            "low_star_pct": safe_pct(self.low_star, total),
+            "high_star_pct": safe_pct(self.high_star, total),
+            "signal_pct": {k: safe_pct(v, total) for k, v in zip(SIGNAL_MATCHER.labels, self.counts)},
+            "signal_counts": dict(zip(SIGNAL_MATCHER.labels, self.counts)),
+            "ci_width_pct": signal_ci_width_pct(self.counts, total),
+        }
+
+
+def analyze_review_signals(
+    review_items: list[dict[str, Any]],
+    pool: AnalysisPool | None = None,
+) -> dict[str, Any]:
+    tally = ReviewSignalTally(pool)
+    tally.add(review_items)
+    return tally.result()
+
+
+def _pack_texts(texts: list[str]) -> tuple[bytes, bytes]:
+    """UTF-8 blob plus per-text byte lengths (``array("I")``), for shipping to workers."""
+    encoded = [t.encode("utf-8", "surrogatepass") for t in texts]
+    return array("I", map(len, encoded)).tobytes(), b"".join(encoded)
+
+
+def _unpack_texts(lengths: bytes, blob: bytes) -> list[str]:
+    sizes = array("I")
+    sizes.frombytes(lengths)
+    texts: list[str] = []
+    offset = 0
+    for size in sizes:
+        texts.append(blob[offset : offset + size].decode("utf-8", "surrogatepass"))
+        offset += size
+    return texts
+
+
+def _review_shard_counts(scores: bytes, lengths: bytes, blob: bytes) -> tuple[int, int, list[int]]:
+    """Worker side of ``AnalysisPool.review_counts`` for one shard of raw reviews."""
+    items = [
+        {"score": score, "content": text}
+        for score, text in zip(array("b", scores), _unpack_texts(lengths, blob))
+    ]
+    return _count_review_signals(items)
+
+
+def _signal_shard_masks(lengths: bytes, blob: bytes) -> bytes:
+    """Worker side of ``AnalysisPool.scan``: packed ``array("I")`` label masks."""
+    return array("I", SIGNAL_MATCHER.scan(_unpack_texts(lengths, blob))).tobytes()
+
+
+class AnalysisPool:
+    """Process pool that shards review analysis across CPU cores.
+
+    Keyword matching holds the GIL, so the thread pools used for fetching
+    cannot spread it over cores. Shards go to the workers as a packed score
+    array, one UTF-8 blob and an array of text lengths rather than as
+    pickled review dicts. Workers return integer counts (or label masks),
+    which are merged in shard order. Results are therefore identical to the
+    single-process path.
+
+    Inputs smaller than two shards are analyzed in-process, where pickling
+    and IPC would cost more than they save.
+    """
+
+    def __init__(self, workers: int, min_shard: int = 10_000) -> None:
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+
+        self.workers = max(1, workers)
+        self.min_shard = max(1, min_shard)
+        # spawn, not fork: the parent runs fetch threads that may hold locks.
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+
+    def wants(self, count: int) -> bool:
+        return count >= 2 * self.min_shard
+
+    def _bounds(self, count: int) -> list[tuple[int, int]]:
+        shards = max(1, min(self.workers, count // self.min_shard))
+        size = -(-count // shards)
+        return [(start, min(start + size, count)) for start in range(0, count, size)]
+
+    def submit_counts(self, review_items: list[dict[str, Any]]) -> Future[tuple[int, int, list[int]]]:
+        """Queue ``_count_review_signals`` of ``review_items`` as one shard."""
+        scores = array("b", (int(r.get("score", 0) or 0) for r in review_items)).tobytes()
+        lengths, blob = _pack_texts([str(r.get("content", "")) for r in review_items])
+        return self._executor.submit(_review_shard_counts, scores, lengths, blob)
+
+    def review_counts(self, review_items: list[dict[str, Any]]) -> tuple[int, int, list[int]]:
+        """``_count_review_signals`` computed shard by shard in the workers."""
+        futures = [self.submit_counts(review_items[start:end]) for start, end in self._bounds(len(review_items))]
+        low_star = 0
+        high_star = 0
+        counts = [0] * len(SIGNAL_MATCHER.labels)
+        for future in futures:
+            low, high, part = future.result()
+            low_star += low
+            high_star += high
+            counts = [a + b for a, b in zip(counts, part)]
+        return low_star, high_star, counts
+
+    def scan(self, texts: list[str]) -> list[int]:
+        """``SIGNAL_MATCHER.scan`` over normalized ``texts``, sharded across workers."""
+        if not self.wants(len(texts)):
+            return SIGNAL_MATCHER.scan(texts)
+        futures = [
+            self._executor.submit(_signal_shard_masks, *_pack_texts(texts[start:end]))
+            for start, end in self._bounds(len(texts))
+        ]
+        masks: list[int] = []
+        for future in futures:
+            part = array("I")
+            part.frombytes(future.result())
+            masks.extend(part)
+        return masks
+
+    def close(self) -> None:
+        self._executor.shutdown()
 
 
 def enrich_with_review_data(
@@ -516,23 +2751,138 @@ def enrich_with_review_data(
     lang: str,
     country: str,
     reviews_per_app: int,
+    workers: int = 1,
+    client: PlayClient | None = None,
+    store: ReviewStore | None = None,
+    review_window: int = 0,
+    max_new: int = 1000,
+    analyze: bool = True,
+    analysis_pool: AnalysisPool | None = None,
+    checkpoint: RunCheckpoint | None = None,
+    seen: SeenReviews | None = None,
+    target_ci_width: float = 0.0,
+    min_reviews: int = 100,
+    on_row: Any = None,
 ) -> None:
-    for row in rows:
+    """Attach review samples and signals to ``rows`` in place.
+
+    Pages for one app are fetched in order (each needs the previous
+    continuation token), but with ``workers > 1`` several apps are paged
+    concurrently. The client's gate bounds the total requests in flight.
+
+    With a ``store`` the fetch is incremental: new reviews are merged into
+    the store, and the newest ``review_window`` stored reviews are analyzed
+    (all of them when the window is 0). ``analyze=False`` only syncs the
+    store, leaving analysis to the batch path. Large samples are sharded
+    across ``analysis_pool`` when one is given.
+
+    Without a store, review pages are analyzed as they arrive and then
+    dropped, so memory per app stays around one page whatever
+    ``reviews_per_app`` is. With ``target_ci_width`` > 0, paging also stops
+    once at least ``min_reviews`` are in and every signal's 95% interval is
+    at most that many points wide; ``reviews_per_app`` is then only a cap.
+
+    With a ``checkpoint``, each app's finished analysis (or, with a store, its
+    completed sync) is saved, and apps already saved are not fetched again.
+
+    Each row records ``review_duplicates`` (repeats dropped while paging) and,
+    with a ``seen`` set, ``review_overlap`` (analyzed reviews already seen in
+    an earlier run).
+
+    ``on_row(row)`` is called for each finished row, in ``rows`` order, as
+    soon as it and every row before it are done.
+    """
+    client = client or PlayClient()
+
+    def enrich_one(row: dict[str, Any]) -> None:
         pkg = str(row.get("package_name"))
+        saved = checkpoint.load_reviews(pkg) if checkpoint is not None else None
+        if saved is not None and store is None and "review_signals" not in saved:
+            saved = None  # raw reviews saved by an older version; fetch again
+        fetch_stats: dict[str, int] = {"duplicates": saved.get("duplicates", 0) if saved else 0}
         try:
-            review_items = collect_reviews(
-                package_name=pkg,
-                lang=lang,
-                country=country,
-                target_count=reviews_per_app,
-            )
-            row["review_sample_size"] = len(review_items)
-            row["review_signals"] = analyze_review_signals(review_items)
+            if store is not None:
+                if saved is not None:
+                    row["review_new_count"] = saved["review_new_count"]
+                else:
+                    seeded = store.watermark(pkg, lang, country) is not None
+                    row["review_new_count"] = sync_reviews(
+                        pkg,
+                        lang=lang,
+                        country=country,
+                        store=store,
+                        max_new=max_new if seeded else reviews_per_app,
+                        client=client,
+                        stats=fetch_stats,
+                    )
+                    if checkpoint is not None:
+                        checkpoint.save_reviews(pkg, {"review_new_count": row["review_new_count"], **fetch_stats})
+                row["review_duplicates"] = fetch_stats["duplicates"]
+                if not analyze:
+                    return
+                review_items = store.load(pkg, lang, country, limit=review_window)
+                if seen is not None:
+                    row["review_overlap"] = seen.observe(pkg, lang, country, review_items)
+                with client.profiler.call("analyze", external=False):
+                    row["review_signals"] = analyze_review_signals(review_items, pool=analysis_pool)
+                row["review_sample_size"] = len(review_items)
+                return
+            if saved is not None:
+                row["review_duplicates"] = fetch_stats["duplicates"]
+                if seen is not None:
+                    row["review_overlap"] = seen.observe_fingerprints(saved["fingerprints"])
+                row["review_signals"] = saved["review_signals"]
+                row["review_sample_size"] = saved["review_signals"]["total_reviews"]
+                return
+            # Converging checks the counts after every page, so pages are
+            # counted in-process rather than queued behind the pool.
+            tally = ReviewSignalTally(analysis_pool if target_ci_width <= 0 else None)
+            fingerprints = array("Q")
+            for page in iter_review_pages(pkg, lang, country, reviews_per_app, client=client, stats=fetch_stats):
+                if seen is not None:
+                    fingerprints.extend(SeenReviews.fingerprint(pkg, lang, country, review_key(item)) for item in page)
+                with client.profiler.call("analyze", external=False):
+                    tally.add(page)
+                    converged = (
+                        target_ci_width > 0
+                        and tally.sampled >= min_reviews
+                        and tally.ci_width_pct() <= target_ci_width
+                    )
+                if converged:
+                    break
+            with client.profiler.call("analyze", external=False):
+                signals = tally.result()
+            if checkpoint is not None:
+                checkpoint.save_reviews(
+                    pkg,
+                    {"review_signals": signals, "fingerprints": list(fingerprints), **fetch_stats},
+                )
+            row["review_duplicates"] = fetch_stats["duplicates"]
+            if seen is not None:
+                row["review_overlap"] = seen.observe_fingerprints(fingerprints)
+            row["review_signals"] = signals
+            row["review_sample_size"] = signals["total_reviews"]
         except Exception as e:
             row["review_sample_size"] = 0
             row["review_signals"] = {}
             row["review_error"] = f"{type(e).__name__}: {e}"
 
+    def enrich_row(row: dict[str, Any]) -> dict[str, Any]:
+        enrich_one(row)
+        return row
+
+    if workers <= 1 or len(rows) <= 1:
+        for row in rows:
+            enrich_one(row)
+            if on_row is not None:
+                on_row(row)
+        return
+
+    with ThreadPoolExecutor(max_workers=min(workers, len(rows)), thread_name_prefix="gp-reviews") as pool:
+        for row in pool.map(enrich_row, rows):
+            if on_row is not None:
+                on_row(row)
+
 
 def category_rollup(rows: list[dict[str, Any]]) -> list[dict[str, Any]]:
     bucket: dict[str, dict[str, Any]] = {}
@@ -595,6 +2945,166 @@ def category_rollup(rows: list[dict[str, Any]]) -> list[dict[str, Any]]:
     return out
 
 
+def _numpy() -> Any:
+    try:
+        import numpy
+    except ImportError as e:
+        raise RuntimeError("batch analysis needs numpy (python3 -m pip install numpy)") from e
+    return numpy
+
+
+@dataclass(frozen=True)
+class ReviewColumns:
+    """Reviews as parallel NumPy columns, for batch analysis of large backfills.
+
+    Entry i of ``app_codes``, ``scores`` and ``texts`` describes one review.
+    ``app_codes`` indexes ``packages``, and ``app_category`` maps each app code
+    to an index into ``categories``.
+    """
+
+    packages: tuple[str, ...]
+    categories: tuple[str, ...]
+    app_category: Any
+    app_codes: Any
+    scores: Any
+    texts: list[str]
+
+    @classmethod
+    def build(
+        cls,
+        package_category: dict[str, str],
+        app_codes: array,
+        scores: array,
+        texts: list[str],
+    ) -> ReviewColumns:
+        np = _numpy()
+        packages = tuple(package_category)
+        categories = tuple(dict.fromkeys(package_category.values()))
+        category_index = {cat: i for i, cat in enumerate(categories)}
+        return cls(
+            packages=packages,
+            categories=categories,
+            app_category=np.array([category_index[package_category[p]] for p in packages], dtype=np.int32),
+            app_codes=np.frombuffer(app_codes, dtype=np.int32) if len(app_codes) else np.zeros(0, dtype=np.int32),
+            scores=np.frombuffer(scores, dtype=np.int8) if len(scores) else np.zeros(0, dtype=np.int8),
+            texts=texts,
+        )
+
+    @classmethod
+    def from_review_lists(
+        cls,
+        reviews_by_package: dict[str, list[dict[str, Any]]],
+        package_category: dict[str, str],
+    ) -> ReviewColumns:
+        index = {pkg: i for i, pkg in enumerate(package_category)}
+        codes = array("i")
+        scores = array("b")
+        texts: list[str] = []
+        for pkg, items in reviews_by_package.items():
+            for item in items:
+                codes.append(index[pkg])
+                scores.append(int(item.get("score", 0) or 0))
+                texts.append(normalize_text(str(item.get("content", ""))))
+        return cls.build(package_category, codes, scores, texts)
+
+
+def review_counts_by_app(
+    columns: ReviewColumns,
+    chunk_size: int = 50_000,
+    pool: AnalysisPool | None = None,
+) -> dict[str, Any]:
+    """Exact per-app counts via group-by reductions over the columns.
+
+    Returns arrays indexed by app code: ``total``, ``low_star``, ``high_star``
+    and ``signals`` (apps x ``SIGNAL_MATCHER.labels``). With a ``pool`` the
+    keyword scan of each chunk is sharded across its worker processes.
+    """
+    scan = pool.scan if pool is not None else SIGNAL_MATCHER.scan
+    np = _numpy()
+    n_apps = len(columns.packages)
+    codes = columns.app_codes
+    signals = np.zeros((n_apps, len(SIGNAL_MATCHER.labels)), dtype=np.int64)
+    for start in range(0, len(columns.texts), chunk_size):
+        masks = np.array(scan(columns.texts[start : start + chunk_size]), dtype=np.int64)
+        chunk_codes = codes[start : start + chunk_size]
+        for bit in range(len(SIGNAL_MATCHER.labels)):
+            hit = ((masks >> bit) & 1).astype(bool)
+            signals[:, bit] += np.bincount(chunk_codes[hit], minlength=n_apps)
+    return {
+        "total": np.bincount(codes, minlength=n_apps),
+        "low_star": np.bincount(codes[columns.scores <= 2], minlength=n_apps),
+        "high_star": np.bincount(codes[columns.scores >= 4], minlength=n_apps),
+        "signals": signals,
+    }
+
+
+def analyze_review_signals_batch(
+    columns: ReviewColumns,
+    counts: dict[str, Any] | None = None,
+) -> dict[str, dict[str, Any]]:
+    """``analyze_review_signals`` for every app in ``columns``, keyed by package."""
+    counts = counts or review_counts_by_app(columns)
+    out: dict[str, dict[str, Any]] = {}
+    for code, pkg in enumerate(columns.packages):
+        total = int(counts["total"][code])
+        signal_counts = [int(counts["signals"][code, bit]) for bit in range(len(SIGNAL_MATCHER.labels))]
+        out[pkg] = {
+            "total_reviews": total,
+            "low_star_pct": safe_pct(int(counts["low_star"][code]), total),
+            "high_star_pct": safe_pct(int(counts["high_star"][code]), total),
+            "signal_pct": {label: safe_pct(c, total) for label, c in zip(SIGNAL_MATCHER.labels, signal_counts)},
+            "signal_counts": dict(zip(SIGNAL_MATCHER.labels, signal_counts)),
+            "ci_width_pct": signal_ci_width_pct(signal_counts, total),
+        }
+    return out
+
+
+def category_rollup_batch(
+    columns: ReviewColumns,
+    counts: dict[str, Any] | None = None,
+) -> list[dict[str, Any]]:
+    """``category_rollup`` computed from exact review counts.
+
+    ``category_rollup`` re-weights per-app percentages that were already
+    rounded. This version sums the underlying counts per category, so the
+    result is exact however many reviews go in.
+    """
+    np = _numpy()
+    counts = counts or review_counts_by_app(columns)
+    n_cats = len(columns.categories)
+    cat_of_app = columns.app_category
+    total = counts["total"]
+    has_reviews = total > 0
+    apps = np.bincount(cat_of_app[has_reviews], minlength=n_cats)
+    reviews = np.bincount(cat_of_app, weights=total, minlength=n_cats).astype(np.int64)
+    low = np.bincount(cat_of_app, weights=counts["low_star"], minlength=n_cats).astype(np.int64)
+    high = np.bincount(cat_of_app, weights=counts["high_star"], minlength=n_cats).astype(np.int64)
+    signal_bits = {label: bit for bit, label in enumerate(SIGNAL_MATCHER.labels)}
+    per_signal = {
+        name: np.bincount(cat_of_app, weights=counts["signals"][:, signal_bits[name]], minlength=n_cats).astype(np.int64)
+        for name in ROLLUP_SIGNALS
+    }
+
+    out: list[dict[str, Any]] = []
+    for code, cat in enumerate(columns.categories):
+        n_reviews = int(reviews[code])
+        if n_reviews <= 0:
+            continue
+        item: dict[str, Any] = {
+            "category": cat,
+            "apps": int(apps[code]),
+            "reviews": n_reviews,
+            "low_star_pct": safe_pct(int(low[code]), n_reviews),
+            "high_star_pct": safe_pct(int(high[code]), n_reviews),
+        }
+        for name in ROLLUP_SIGNALS:
+            item[f"{name}_pct"] = safe_pct(int(per_signal[name][code]), n_reviews)
+        out.append(item)
+
+    out.sort(key=lambda x: x["reviews"], reverse=True)
+    return out
+
+
 def app_takeaways(rows: list[dict[str, Any]], limit: int = 12) -> list[str]:
     ranked = sorted(
         [r for r in rows if r.get("status") == "ok"],
@@ -765,6 +3275,10 @@ def emit_markdown(
     reviews_per_app: int,
     hits_per_query: int,
     max_apps: int,
+    review_window: int | None = None,
+    query_stats: list[dict[str, Any]] | None = None,
+    history: dict[str, Any] | None = None,
+    target_ci_width: float = 0.0,
 ) -> None:
     lines: list[str] = []
     lines.append("# Market Intelligence Report")
@@ -772,7 +3286,23 @@ def emit_markdown(
     lines.append(f"- Generated at (UTC): `{generated_at}`")
     lines.append(f"- Scope: Play Store `{country.upper()}` / `{lang}`")
     lines.append(f"- Discovery depth: `{hits_per_query}` hits/query, up to `{max_apps}` apps")
-    lines.append(f"- Review sample: newest `{reviews_per_app}` reviews/app")
+    if review_window is None and target_ci_width > 0:
+        lines.append(
+            f"- Review sample: newest reviews until every signal's 95% CI is at most `{target_ci_width}` pts wide, "
+            f"up to `{reviews_per_app}` reviews/app"
+        )
+    elif review_window is None:
+        lines.append(f"- Review sample: newest `{reviews_per_app}` reviews/app")
+    else:
+        window = f"newest `{review_window}`" if review_window > 0 else "all"
+        lines.append(f"- Review sample: {window} stored reviews/app (incremental sync)")
+    sampled = sum(int(r.get("review_sample_size") or 0) for r in selected_rows)
+    duplicates = sum(int(r.get("review_duplicates") or 0) for r in selected_rows)
+    dedup_line = f"- Review dedup: `{duplicates}` repeated reviews dropped while paging"
+    if any("review_overlap" in r for r in selected_rows):
+        overlap = sum(int(r.get("review_overlap") or 0) for r in selected_rows)
+        dedup_line += f"; `{overlap}` of `{sampled}` analyzed reviews ({safe_pct(overlap, sampled)}%) seen in earlier runs"
+    lines.append(dedup_line)
     lines.append("")
 
     lines.append("## Source Reachability")
@@ -788,8 +3318,8 @@ def emit_markdown(
 
     lines.append("## Selected App Universe")
     lines.append("")
-    lines.append("| Category | App | Package | Installs | Score | Ratings | Reviews sampled |")
-    lines.append("|---|---|---|---:|---:|---:|---:|")
+    lines.append("| Category | App | Package | Installs | Score | Ratings | Reviews sampled | Signal CI width (pts) |")
+    lines.append("|---|---|---|---:|---:|---:|---:|---:|")
     for row in sorted(
         selected_rows,
         key=lambda r: (
@@ -800,7 +3330,8 @@ def emit_markdown(
     ):
         lines.append(
             f"| {row.get('category')} | {row.get('title')} | `{row.get('package_name')}` | {row.get('installs')} | "
-            f"{row.get('score', 'n/a')} | {row.get('ratings', 'n/a')} | {row.get('review_sample_size', 0)} |"
+            f"{row.get('score', 'n/a')} | {row.get('ratings', 'n/a')} | {row.get('review_sample_size', 0)} | "
+            f"{(row.get('review_signals') or {}).get('ci_width_pct', 'n/a')} |"
         )
     lines.append("")
 
@@ -815,6 +3346,47 @@ def emit_markdown(
         )
     lines.append("")
 
+    if history is not None:
+        lines.append("## Changes Since Previous Run")
+        lines.append("")
+        if not history["previous_generated_at"]:
+            lines.append("- First recorded run for this market; deltas start with the next run.")
+        else:
+            lines.append(
+                f"- Previous run: `{history['previous_generated_at']}` "
+                f"(trend covers the last {history['runs_recorded']} runs, from exact review counts)"
+            )
+            lines.append("")
+            lines.append("| Category | Signal | Previous % | Current % | Change (pts) | Trend |")
+            lines.append("|---|---|---:|---:|---:|---|")
+            for d in history["signals"]:
+                previous = "n/a" if d["previous_pct"] is None else d["previous_pct"]
+                delta = "n/a" if d["delta_pts"] is None else f"{d['delta_pts']:+.1f}"
+                trend = " → ".join(str(v) for v in d["trend"])
+                lines.append(f"| {d['category']} | {d['signal']} | {previous} | {d['current_pct']} | {delta} | {trend} |")
+            if history["apps"]:
+                lines.append("")
+                lines.append("| Package | Status | Installs change | Score change | Ratings change |")
+                lines.append("|---|---|---:|---:|---:|")
+                for a in history["apps"]:
+                    lines.append(
+                        f"| `{a['package_name']}` | {a['status']} | {a.get('installs_delta', '')} | "
+                        f"{a.get('score_delta', '')} | {a.get('ratings_delta', '')} |"
+                    )
+        lines.append("")
+
+    if query_stats:
+        lines.append("## Discovery Query Yield")
+        lines.append("")
+        lines.append("| Segment | Query | Hits | New in segment | New overall | Notes |")
+        lines.append("|---|---|---:|---:|---:|---|")
+        for q in query_stats:
+            note = "skipped (low yield)" if q["skipped"] else ("reused identical search" if q["shared_search"] else "")
+            lines.append(
+                f"| {q['segment']} | {q['query']} | {q['hits']} | {q['new_in_segment']} | {q['new_overall']} | {note} |"
+            )
+        lines.append("")
+
     lines.append("## App-Level Takeaways")
     lines.append("")
     lines.extend(app_notes)
@@ -831,105 +3403,982 @@ def emit_markdown(
     output_path.write_text("\n".join(lines), encoding="utf-8")
 
 
-def main() -> int:
+class JsonlReportWriter:
+    """Streams report records to a JSON Lines file as pipeline stages finish.
+
+    Each line is ``{"type": ..., "data": ...}``. Records go to a temporary
+    file, which replaces ``path`` on close, so readers never see a
+    half-written report. ``abort`` removes it instead, for a failed run.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._tmp_path = path.with_name(path.name + ".tmp")
+        self._fh = self._tmp_path.open("w", encoding="utf-8")
+        self._lock = threading.Lock()
+
+    def write(self, record_type: str, data: Any) -> None:
+        line = json.dumps({"type": record_type, "data": data}, ensure_ascii=True, separators=(",", ":"), default=_json_default)
+        with self._lock:
+            self._fh.write(line)
+            self._fh.write("\n")
+
+    def write_many(self, record_type: str, items: list[Any]) -> None:
+        for item in items:
+            self.write(record_type, item)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._fh.closed:
+                return
+            self._fh.close()
+            os.replace(self._tmp_path, self.path)
+
+    def abort(self) -> None:
+        """Drop the unfinished report, leaving any earlier ``path`` in place."""
+        with self._lock:
+            if self._fh.closed:
+                return
+            self._fh.close()
+            self._tmp_path.unlink(missing_ok=True)
+
+    def __enter__(self) -> JsonlReportWriter:
+        return self
+
+    def __exit__(self, exc_type: Any, *exc: Any) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+def iter_report_records(path: Path, record_types: set[str] | None = None) -> Iterator[dict[str, Any]]:
+    """Yield records from a ``market_scan_latest.jsonl`` report one at a time.
+
+    ``record_types`` narrows the output, e.g. ``{"app"}``. Only the current
+    line is held in memory.
+    """
+    with path.open("r", encoding="utf-8") as fh:
+        for line in fh:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            if record_types is None or record.get("type") in record_types:
+                yield record
+
+
+@contextmanager
+def atomic_open(path: Path, mode: str = "wb") -> Iterator[Any]:
+    """A handle on a temporary file that replaces ``path`` once it is synced.
+
+    If the block raises, the temporary file is removed and ``path`` is left
+    untouched.
+    """
+    tmp_path = path.with_name(path.name + ".tmp")
+    encoding = None if "b" in mode else "utf-8"
+    try:
+        with tmp_path.open(mode, encoding=encoding) as fh:
+            yield fh
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+def atomic_write_bytes(path: Path, data: bytes) -> None:
+    """Write ``data`` to ``path`` via a synced temporary file and ``os.replace``."""
+    with atomic_open(path, "wb") as fh:
+        fh.write(data)
+
+
+def atomic_write_text(path: Path, text: str) -> None:
+    atomic_write_bytes(path, text.encode("utf-8"))
+
+
+class RunCheckpoint:
+    """Stage outputs of one market run, kept so an interrupted run can resume.
+
+    Each finished stage (``candidates``, ``meta_rows``, ``selected_rows``) and
+    each app whose reviews were fetched is saved as its own JSON file. Every
+    file is written atomically, so a killed run leaves either the old state
+    or the new one and never a torn file. A manifest records the settings
+    that shape the results. A checkpoint made with other settings is
+    discarded instead of resumed. The directory is removed once the market's
+    reports are written.
+    """
+
+    def __init__(self, path: Path, settings: dict[str, Any], resume: bool) -> None:
+        self.path = path
+        self.resumed = False
+        manifest_path = path / "manifest.json"
+        if resume and manifest_path.exists():
+            try:
+                manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                manifest = None
+            self.resumed = manifest == {"settings": settings}
+            if not self.resumed:
+                print(f"Checkpoint in {path} was made with other settings; starting over")
+        if not self.resumed and path.exists():
+            shutil.rmtree(path)
+        (path / "reviews").mkdir(parents=True, exist_ok=True)
+        self._write(manifest_path, {"settings": settings})
+
+    def _write(self, path: Path, data: Any) -> None:
+        atomic_write_text(path, json.dumps(data, ensure_ascii=True, separators=(",", ":"), default=_json_default))
+
+    def _read(self, path: Path) -> Any:
+        if not path.exists():
+            return None
+        return json.loads(path.read_text(encoding="utf-8"), object_hook=_json_object_hook)
+
+    def load(self, stage: str) -> Any:
+        """A saved stage output, or None when the stage has not finished."""
+        return self._read(self.path / f"{stage}.json")
+
+    def save(self, stage: str, data: Any) -> None:
+        self._write(self.path / f"{stage}.json", data)
+
+    def load_reviews(self, package_name: str) -> dict[str, Any] | None:
+        return self._read(self.path / "reviews" / f"{package_name}.json")
+
+    def save_reviews(self, package_name: str, data: dict[str, Any]) -> None:
+        self._write(self.path / "reviews" / f"{package_name}.json", data)
+
+    def finish(self) -> None:
+        shutil.rmtree(self.path, ignore_errors=True)
+
+
+def category_cap_arg(value: str) -> str:
+    """argparse type for ``--category-cap CATEGORY=N``."""
+    cat, sep, count = value.partition("=")
+    if not sep or cat not in DEFAULT_CATEGORY_CAPS or not count.strip().isdigit():
+        raise argparse.ArgumentTypeError(f"expected one of {list(DEFAULT_CATEGORY_CAPS)}=N, got {value!r}")
+    return f"{cat}={int(count)}"
+
+
+def category_caps(values: list[str]) -> dict[str, int]:
+    """``DEFAULT_CATEGORY_CAPS`` with ``--category-cap`` overrides applied."""
+    caps = dict(DEFAULT_CATEGORY_CAPS)
+    for value in values:
+        cat, _, count = value.partition("=")
+        caps[cat] = int(count)
+    return caps
+
+
+def parse_cache_ttls(values: list[str]) -> dict[str, float]:
+    ttls: dict[str, float] = {}
+    for value in values:
+        call, sep, seconds = value.partition("=")
+        if not sep or call not in DEFAULT_CACHE_TTL_S:
+            raise SystemExit(f"Invalid --cache-ttl {value!r}; expected one of {sorted(DEFAULT_CACHE_TTL_S)}=SECONDS")
+        ttls[call] = float(seconds)
+    return ttls
+
+
+def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(description="Generate market intelligence report for addiction-blocking apps.")
     parser.add_argument("--country", default="us", help="Play Store country code (default: us)")
     parser.add_argument("--lang", default="en", help="Play Store language code (default: en)")
+    parser.add_argument(
+        "--markets",
+        default="",
+        help="Comma-separated country:lang pairs scanned concurrently in one run, e.g. us:en,gb:en,de:de",
+    )
     parser.add_argument("--reviews-per-app", type=int, default=120, help="Newest reviews sampled per app")
+    parser.add_argument(
+        "--target-ci-width",
+        type=float,
+        default=0.0,
+        help="Stop sampling an app once every signal's 95%% confidence interval is at most this many percentage "
+        "points wide; --reviews-per-app becomes the cap (default: 0, fixed sample)",
+    )
+    parser.add_argument(
+        "--min-reviews-per-app",
+        type=int,
+        default=100,
+        help="Reviews sampled before --target-ci-width may stop an app (default: 100)",
+    )
     parser.add_argument("--hits-per-query", type=int, default=12, help="Number of discovery hits per query")
+    parser.add_argument(
+        "--min-query-yield",
+        type=int,
+        default=0,
+        help="Skip the rest of a search segment once a query adds fewer new apps than this; 0 runs all (default: 0)",
+    )
     parser.add_argument("--apps", type=int, default=22, help="Max apps selected for deep analysis")
+    parser.add_argument(
+        "--category-cap",
+        action="append",
+        default=[],
+        type=category_cap_arg,
+        metavar="CATEGORY=N",
+        help=f"Max apps selected from one category (defaults: {', '.join(f'{k}={v}' for k, v in DEFAULT_CATEGORY_CAPS.items())}); "
+        "repeatable",
+    )
     parser.add_argument("--min-installs", type=int, default=10000, help="Minimum installs count filter")
+    parser.add_argument(
+        "--no-prefilter",
+        action="store_true",
+        help="Fetch metadata for every candidate instead of skipping those whose search-reported installs "
+        "cannot reach --min-installs",
+    )
     parser.add_argument("--out-dir", default="artifacts/market", help="Output directory")
-    args = parser.parse_args()
+    parser.add_argument("--compact", action="store_true", help="Write market_scan_latest.json without indentation")
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continue an interrupted run from the checkpoint in the out dir, skipping finished stages and apps",
+    )
+    parser.add_argument(
+        "--probe-budget",
+        type=float,
+        default=30.0,
+        help="Total seconds allowed for source reachability probes (default: 30)",
+    )
+    parser.add_argument("--trace-out", default="", help="Also write a Chrome trace (JSON) of stages and calls to this path")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Apps processed concurrently for metadata and review fetches (default: 1)",
+    )
+    parser.add_argument(
+        "--max-in-flight",
+        type=int,
+        default=0,
+        help="Global cap on concurrent Play requests, 0 = same as --workers (default: 0)",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        default=".market-scan-cache",
+        help="Directory for the on-disk Play response cache (default: .market-scan-cache)",
+    )
+    parser.add_argument("--no-cache", action="store_true", help="Disable the Play response cache")
+    parser.add_argument("--refresh", action="store_true", help="Ignore cached responses but store fresh ones")
+    parser.add_argument(
+        "--cache-ttl",
+        action="append",
+        default=[],
+        metavar="CALL=SECONDS",
+        help="Override cache TTL per call type (search, app, reviews); repeatable",
+    )
+    parser.add_argument("--cache-max-mb", type=int, default=256, help="Cache size before LRU eviction (default: 256)")
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Keep reviews in a local store and only fetch reviews newer than the stored ones",
+    )
+    parser.add_argument(
+        "--review-store",
+        default=".market-scan-cache/reviews.sqlite3",
+        help="SQLite review store used by --incremental (default: .market-scan-cache/reviews.sqlite3)",
+    )
+    parser.add_argument(
+        "--review-window",
+        type=int,
+        default=0,
+        help="With --incremental, analyze only the newest N stored reviews per app; 0 = all (default: 0)",
+    )
+    parser.add_argument(
+        "--incremental-max-new",
+        type=int,
+        default=1000,
+        help="With --incremental, cap on new reviews fetched per app per run (default: 1000)",
+    )
+    parser.add_argument(
+        "--history-db",
+        default=".market-scan-cache/history.sqlite3",
+        help="SQLite store each run appends its per-app signal counts and metadata to (default: .market-scan-cache/history.sqlite3)",
+    )
+    parser.add_argument(
+        "--seen-reviews",
+        default=".market-scan-cache/seen_reviews.bin",
+        help="Fingerprints of reviews analyzed in earlier runs, for overlap counts (default: .market-scan-cache/seen_reviews.bin)",
+    )
+    parser.add_argument(
+        "--no-history",
+        action="store_true",
+        help="Do not record this run, report changes since the last one, or track review overlap",
+    )
+    parser.add_argument(
+        "--batch-analysis",
+        action="store_true",
+        help="With --incremental, analyze stored reviews as NumPy columns and roll up exact counts (needs numpy)",
+    )
+    parser.add_argument(
+        "--analysis-workers",
+        type=int,
+        default=1,
+        help="Processes used to analyze large review samples; 1 analyzes in-process (default: 1)",
+    )
+    parser.add_argument(
+        "--record-fixtures",
+        default="",
+        metavar="PATH",
+        help="Also save every Play response and source probe to this fixture archive (.jsonl.gz); "
+        "disables the response cache",
+    )
+    parser.add_argument(
+        "--replay-fixtures",
+        default="",
+        metavar="PATH",
+        help="Serve Play responses and source probes from this fixture archive instead of the network; "
+        "disables the response cache",
+    )
+    parser.add_argument(
+        "--replay-latency-ms",
+        type=float,
+        default=0.0,
+        help="With --replay-fixtures, simulated latency per call (0.5x-1.5x jitter) in ms (default: 0)",
+    )
+    parser.add_argument(
+        "--replay-error-rate",
+        type=float,
+        default=0.0,
+        help="With --replay-fixtures, share of calls failed with a retryable 503 (default: 0)",
+    )
+    parser.add_argument(
+        "--rate-limit",
+        type=float,
+        default=0.0,
+        help="Max Play requests started per second per host, 0 disables (default: 0)",
+    )
+    parser.add_argument(
+        "--rate-burst",
+        type=int,
+        default=1,
+        help="Play requests allowed back to back before --rate-limit spacing applies (default: 1)",
+    )
+    parser.add_argument(
+        "--max-retries",
+        type=int,
+        default=4,
+        help="Retries for throttled (429/503) or transient Play failures, with jittered backoff (default: 4)",
+    )
+    parser.add_argument(
+        "--request-timeout",
+        type=float,
+        default=30.0,
+        help="Per-request timeout in seconds for Play calls, 0 disables (default: 30)",
+    )
+    return parser
 
-    generated_at = now_iso()
-    out_dir = Path(args.out_dir).resolve()
-    out_dir.mkdir(parents=True, exist_ok=True)
 
-    source_status: list[dict[str, Any]] = []
-    for name, url in SOURCE_URLS:
-        row = fetch_url_status(url)
-        row["name"] = name
-        source_status.append(row)
+def parse_markets(value: str) -> list[tuple[str, str]]:
+    markets: list[tuple[str, str]] = []
+    for item in value.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        country, sep, lang = item.partition(":")
+        if not sep or not country.strip() or not lang.strip():
+            raise SystemExit(f"Invalid market {item!r}; expected country:lang, e.g. us:en")
+        market = (country.strip().lower(), lang.strip().lower())
+        if market not in markets:
+            markets.append(market)
+    return markets
+
 
-    report_md = out_dir / "market_scan_latest.md"
-    report_json = out_dir / "market_scan_latest.json"
-    tasks_md = out_dir / "ui_ux_tasks_latest.md"
+# Arguments that change what a market run produces; a checkpoint is only
+# resumed when they match.
+CHECKPOINT_SETTINGS = [
+    "hits_per_query",
+    "min_query_yield",
+    "apps",
+    "min_installs",
+    "category_cap",
+    "no_prefilter",
+    "reviews_per_app",
+    "target_ci_width",
+    "min_reviews_per_app",
+    "incremental",
+    "review_window",
+    "incremental_max_new",
+    "batch_analysis",
+]
 
-    play_error = ""
-    selected_rows: list[dict[str, Any]] = []
-    rollups: list[dict[str, Any]] = []
-    notes: list[str] = []
-    tasks: list[dict[str, str]] = []
 
-    if gp_app is None or gp_reviews is None or gp_search is None or Sort is None:
-        play_error = "google_play_scraper not installed"
-    else:
-        candidates = discover_candidates(
-            lang=args.lang,
-            country=args.country,
-            hits_per_query=args.hits_per_query,
-        )
-        meta_rows = fetch_metadata_for_candidates(candidates, lang=args.lang, country=args.country)
-        selected_rows = select_apps(meta_rows, max_apps=args.apps, min_installs=args.min_installs)
-        enrich_with_review_data(selected_rows, lang=args.lang, country=args.country, reviews_per_app=args.reviews_per_app)
-        rollups = category_rollup(selected_rows)
-        notes = app_takeaways(selected_rows, limit=14)
-        tasks = build_priority_tasks(selected_rows, rollups)
-
-    if not selected_rows and play_error:
+@dataclass
+class MarketRun:
+    """State and results of the pipeline for one (country, lang) market."""
+
+    country: str
+    lang: str
+    out_dir: Path
+    generated_at: str
+    profiler: PipelineProfiler
+    stream: JsonlReportWriter
+    checkpoint: RunCheckpoint | None = None
+    play_error: str = ""
+    query_stats: list[dict[str, Any]] = field(default_factory=list)
+    prefilter_skipped: list[dict[str, Any]] = field(default_factory=list)
+    selected_rows: list[dict[str, Any]] = field(default_factory=list)
+    rollups: list[dict[str, Any]] = field(default_factory=list)
+    tasks: list[dict[str, str]] = field(default_factory=list)
+    history: dict[str, Any] | None = None
+
+    @property
+    def label(self) -> str:
+        return f"{self.country}:{self.lang}"
+
+    @classmethod
+    def open(cls, country: str, lang: str, out_dir: Path, generated_at: str, args: argparse.Namespace) -> MarketRun:
+        out_dir.mkdir(parents=True, exist_ok=True)
+        run = cls(
+            country=country,
+            lang=lang,
+            out_dir=out_dir,
+            generated_at=generated_at,
+            profiler=PipelineProfiler(),
+            stream=JsonlReportWriter(out_dir / "market_scan_latest.jsonl"),
+            checkpoint=RunCheckpoint(
+                out_dir / ".checkpoint",
+                settings={
+                    "country": country,
+                    "lang": lang,
+                    # Saved rows hold text_hits, which are only valid for this vocabulary.
+                    "text_vocab": TEXT_MATCHER_ID,
+                    **{key: getattr(args, key) for key in CHECKPOINT_SETTINGS},
+                },
+                resume=args.resume,
+            ),
+        )
+        run.stream.write(
+            "run",
+            {
+                "generated_at": generated_at,
+                "country": country,
+                "lang": lang,
+                "reviews_per_app": args.reviews_per_app,
+                "hits_per_query": args.hits_per_query,
+                "max_apps": args.apps,
+            },
+        )
+        return run
+
+
+def run_market_pipeline(
+    run: MarketRun,
+    args: argparse.Namespace,
+    client: PlayClient,
+    review_store: ReviewStore | None,
+    analysis_pool: AnalysisPool | None = None,
+    history: SignalHistory | None = None,
+    seen: SeenReviews | None = None,
+) -> None:
+    """Discovery through analysis for one market; results land on ``run``.
+
+    Stages already saved in ``run.checkpoint`` are loaded instead of rerun.
+    """
+    profiler = run.profiler
+    checkpoint = run.checkpoint
+    batch = review_store is not None and args.batch_analysis
+    with profiler.stage("discovery"):
+        saved = checkpoint.load("candidates") if checkpoint is not None else None
+        if saved is not None:
+            candidates = {app_id: Candidate.from_json(cand) for app_id, cand in saved["candidates"].items()}
+            run.query_stats[:] = saved["query_stats"]
+        else:
+            candidates = discover_candidates(
+                lang=run.lang,
+                country=run.country,
+                hits_per_query=args.hits_per_query,
+                client=client,
+                workers=args.workers,
+                min_query_yield=args.min_query_yield,
+                query_stats=run.query_stats,
+            )
+            if checkpoint is not None:
+                checkpoint.save(
+                    "candidates",
+                    {
+                        "candidates": {app_id: cand.to_json() for app_id, cand in candidates.items()},
+                        "query_stats": run.query_stats,
+                    },
+                )
+    run.stream.write_many("query", run.query_stats)
+    if not args.no_prefilter:
+        with profiler.stage("prefilter"):
+            considered = len(candidates)
+            candidates = prefilter_candidates(candidates, args.min_installs, skipped=run.prefilter_skipped)
+        run.stream.write_many("prefilter_skip", run.prefilter_skipped)
+        print(
+            f"Prefilter ({run.label}): skipped {len(run.prefilter_skipped)} of {considered} candidates "
+            f"below --min-installs {args.min_installs:,}"
+        )
+    with profiler.stage("metadata"):
+        saved_rows = checkpoint.load("meta_rows") if checkpoint is not None else None
+        if saved_rows is not None:
+            meta_rows = [AppRow.from_json(data) for data in saved_rows]
+        else:
+            meta_rows = fetch_metadata_for_candidates(
+                candidates,
+                lang=run.lang,
+                country=run.country,
+                workers=args.workers,
+                client=client,
+            )
+            if checkpoint is not None:
+                checkpoint.save("meta_rows", [row.to_json(text_hits=True) for row in meta_rows])
+    with profiler.stage("selection"):
+        selected_rows = checkpoint.load("selected_rows") if checkpoint is not None else None
+        if selected_rows is None:
+            picks = select_apps(
+                meta_rows,
+                max_apps=args.apps,
+                min_installs=args.min_installs,
+                category_caps=category_caps(args.category_cap),
+            )
+            selected_rows = [row.to_json() for row in picks]
+            if checkpoint is not None:
+                checkpoint.save("selected_rows", selected_rows)
+    with profiler.stage("reviews"):
+        enrich_with_review_data(
+            selected_rows,
+            lang=run.lang,
+            country=run.country,
+            reviews_per_app=args.reviews_per_app,
+            workers=args.workers,
+            client=client,
+            store=review_store,
+            review_window=args.review_window,
+            max_new=args.incremental_max_new,
+            analyze=not args.batch_analysis,
+            analysis_pool=analysis_pool,
+            checkpoint=checkpoint,
+            seen=seen,
+            target_ci_width=args.target_ci_width,
+            min_reviews=args.min_reviews_per_app,
+            # Batch analysis fills in the signals later, in the analysis stage.
+            on_row=None if batch else lambda row: run.stream.write("app", row),
+        )
+    with profiler.stage("analysis"):
+        if batch:
+            package_category = {str(r["package_name"]): str(r.get("category", "other")) for r in selected_rows}
+            columns = ReviewColumns.build(
+                package_category,
+                *review_store.columns(list(package_category), lang=run.lang, country=run.country, limit=args.review_window),
+            )
+            counts = review_counts_by_app(columns, pool=analysis_pool)
+            per_app = analyze_review_signals_batch(columns, counts)
+            for row in selected_rows:
+                signals = per_app[str(row["package_name"])]
+                row["review_sample_size"] = signals["total_reviews"]
+                row["review_signals"] = signals
+            run.stream.write_many("app", selected_rows)
+            rollups = category_rollup_batch(columns, counts)
+        else:
+            rollups = category_rollup(selected_rows)
+        run.stream.write_many("rollup", rollups)
+        run.tasks = build_priority_tasks(selected_rows, rollups)
+        run.stream.write_many("task", run.tasks)
+        if history is not None:
+            history.record_run(run.generated_at, run.country, run.lang, selected_rows)
+            run.history = history_deltas(history, run.country, run.lang)
+    run.selected_rows = selected_rows
+    run.rollups = rollups
+
+
+# Version of the market_scan_latest.json layout. 2: app records no longer
+# carry "description", which is dropped once the app is classified.
+PAYLOAD_SCHEMA_VERSION = 2
+
+
+def market_payload(run: MarketRun, args: argparse.Namespace, source_status: list[dict[str, Any]]) -> dict[str, Any]:
+    """The ``market_scan_latest.json`` payload of one market, minus its profile."""
+    return {
+        "schema_version": PAYLOAD_SCHEMA_VERSION,
+        "generated_at": run.generated_at,
+        "country": run.country,
+        "lang": run.lang,
+        "reviews_per_app": args.reviews_per_app,
+        "hits_per_query": args.hits_per_query,
+        "max_apps": args.apps,
+        "review_window": args.review_window if args.incremental else None,
+        "review_target_ci_width": args.target_ci_width if not args.incremental else 0.0,
+        "sources": source_status,
+        "discovery_queries": run.query_stats,
+        "prefilter_skipped": run.prefilter_skipped,
+        "play_error": run.play_error,
+        "selected_apps": run.selected_rows,
+        "category_rollups": run.rollups,
+        "uiux_tasks": run.tasks,
+        "history": run.history,
+    }
+
+
+SCRAPER_MISSING_ERROR = "google_play_scraper not installed"
+
+
+def write_market_markdown(out_dir: Path, payload: dict[str, Any]) -> list[Path]:
+    """Render the markdown report and task list of one market from its JSON payload."""
+    report_md = out_dir / "market_scan_latest.md"
+    tasks_md = out_dir / "ui_ux_tasks_latest.md"
+    if not payload["selected_apps"] and payload["play_error"]:
         fallback = [
             "# Market Intelligence Report",
             "",
-            f"- Generated at (UTC): `{generated_at}`",
-            f"- Error: `{play_error}`",
-            "",
-            "Install dependency and rerun:",
-            "",
-            "```bash",
-            "python3 -m pip install google-play-scraper",
-            "python3 scripts/market_scan.py",
-            "```",
+            f"- Generated at (UTC): `{payload['generated_at']}`",
+            f"- Error: `{payload['play_error']}`",
             "",
         ]
+        if payload["play_error"] == SCRAPER_MISSING_ERROR:
+            fallback += [
+                "Install dependency and rerun:",
+                "",
+                "```bash",
+                "python3 -m pip install google-play-scraper",
+                "python3 scripts/market_scan.py",
+                "```",
+                "",
+            ]
+        else:
+            fallback += [
+                "The scan failed before any app was analyzed. Fix the error above and rerun;",
+                "`--resume` continues from the last finished stage.",
+                "",
+            ]
         report_md.write_text("\n".join(fallback), encoding="utf-8")
         tasks_md.write_text("# UI/UX Task Backlog\n\nNo data (market scan failed).\n", encoding="utf-8")
     else:
         emit_markdown(
             output_path=report_md,
-            generated_at=generated_at,
-            source_status=source_status,
-            selected_rows=selected_rows,
-            rollups=rollups,
-            app_notes=notes,
-            country=args.country,
-            lang=args.lang,
-            reviews_per_app=args.reviews_per_app,
-            hits_per_query=args.hits_per_query,
-            max_apps=args.apps,
+            generated_at=payload["generated_at"],
+            source_status=payload["sources"],
+            selected_rows=payload["selected_apps"],
+            rollups=payload["category_rollups"],
+            app_notes=app_takeaways(payload["selected_apps"], limit=14),
+            country=payload["country"],
+            lang=payload["lang"],
+            reviews_per_app=payload["reviews_per_app"],
+            hits_per_query=payload["hits_per_query"],
+            max_apps=payload["max_apps"],
+            review_window=payload.get("review_window"),
+            target_ci_width=payload.get("review_target_ci_width") or 0.0,
+            query_stats=payload.get("discovery_queries"),
+            history=payload.get("history"),
         )
-        emit_uiux_tasks(tasks_md, generated_at=generated_at, tasks=tasks)
+        emit_uiux_tasks(tasks_md, generated_at=payload["generated_at"], tasks=payload["uiux_tasks"])
+    return [report_md, tasks_md]
 
-    payload = {
-        "generated_at": generated_at,
-        "country": args.country,
-        "lang": args.lang,
-        "reviews_per_app": args.reviews_per_app,
-        "hits_per_query": args.hits_per_query,
-        "max_apps": args.apps,
-        "sources": source_status,
-        "play_error": play_error,
-        "selected_apps": selected_rows,
-        "category_rollups": rollups,
-        "uiux_tasks": tasks,
+
+def emit_market_reports(run: MarketRun, args: argparse.Namespace, source_status: list[dict[str, Any]]) -> list[Path]:
+    """Write the markdown, task list, JSON and JSONL outputs for one market."""
+    report_json = run.out_dir / "market_scan_latest.json"
+
+    run.stream.write_many("source", source_status)
+    payload = market_payload(run, args, source_status)
+    with run.profiler.stage("emit"):
+        report_md, tasks_md = write_market_markdown(run.out_dir, payload)
+
+    # The JSON payload is written after "emit" closes so it can carry the
+    # finished profile.
+    profile = run.profiler.summary()
+    payload["profile"] = profile
+    write_json(report_json, payload, compact=args.compact)
+    run.stream.write("profile", profile)
+    run.stream.write("end", {"play_error": run.play_error, "apps": len(run.selected_rows)})
+    run.stream.close()
+    if run.checkpoint is not None and not run.play_error:
+        run.checkpoint.finish()
+    return [report_md, report_json, run.stream.path, tasks_md]
+
+
+def write_json(path: Path, payload: Any, compact: bool = False) -> None:
+    # Streamed into the temporary file, so the document is never held whole.
+    with atomic_open(path, "w") as fh:
+        json.dump(
+            payload,
+            fh,
+            ensure_ascii=True,
+            indent=None if compact else 2,
+            separators=(",", ":") if compact else None,
+            default=_json_default,
+        )
+
+
+def cross_market_rollup(runs: list[MarketRun]) -> dict[str, Any]:
+    """Combine per-market results: pooled category rollups and app overlap."""
+    all_rows: list[dict[str, Any]] = []
+    apps: dict[str, dict[str, Any]] = {}
+    for run in runs:
+        for row in run.selected_rows:
+            all_rows.append(row)
+            pkg = str(row.get("package_name"))
+            entry = apps.setdefault(
+                pkg,
+                {
+                    "package_name": pkg,
+                    "title": row.get("title"),
+                    "category": row.get("category"),
+                    "markets": [],
+                    "max_installs_count": 0,
+                    "reviews_sampled": 0,
+                },
+            )
+            entry["markets"].append(run.label)
+            entry["max_installs_count"] = max(entry["max_installs_count"], int(row.get("installs_count") or 0))
+            entry["reviews_sampled"] += int(row.get("review_sample_size") or 0)
+
+    return {
+        "markets": [
+            {
+                "market": run.label,
+                "country": run.country,
+                "lang": run.lang,
+                "apps": len(run.selected_rows),
+                "play_error": run.play_error,
+                "category_rollups": run.rollups,
+            }
+            for run in runs
+        ],
+        "category_rollups": category_rollup(all_rows),
+        "apps": sorted(apps.values(), key=lambda a: (-len(a["markets"]), -a["max_installs_count"], a["package_name"])),
     }
-    report_json.write_text(json.dumps(payload, ensure_ascii=True, indent=2), encoding="utf-8")
 
-    print(f"Wrote: {report_md}")
-    print(f"Wrote: {report_json}")
-    print(f"Wrote: {tasks_md}")
+
+def emit_cross_market_markdown(output_path: Path, generated_at: str, rollup: dict[str, Any]) -> None:
+    lines: list[str] = []
+    lines.append("# Cross-Market Intelligence Report")
+    lines.append("")
+    lines.append(f"- Generated at (UTC): `{generated_at}`")
+    market_labels = ", ".join(f"`{m['market']}`" for m in rollup["markets"])
+    lines.append(f"- Markets: {market_labels}")
+    lines.append("")
+
+    lines.append("## Pooled Category Signal Rollup")
+    lines.append("")
+    lines.append("| Category | Apps | Reviews | Low-star % | High-star % | Paywall % | Bugs % | Bypass % | Effective % | UI confusion % |")
+    lines.append("|---|---:|---:|---:|---:|---:|---:|---:|---:|---:|")
+    for r in rollup["category_rollups"]:
+        lines.append(
+            f"| {r['category']} | {r['apps']} | {r['reviews']} | {r['low_star_pct']} | {r['high_star_pct']} | "
+            f"{r['paywall_pct']} | {r['bugs_pct']} | {r['bypass_pct']} | {r['effective_pct']} | {r['ui_confusion_pct']} |"
+        )
+    lines.append("")
+
+    lines.append("## Per-Market Rollup")
+    lines.append("")
+    lines.append("| Market | Category | Apps | Reviews | Low-star % | Paywall % | Bugs % | Bypass % |")
+    lines.append("|---|---|---:|---:|---:|---:|---:|---:|")
+    for market in rollup["markets"]:
+        if market["play_error"]:
+            lines.append(f"| {market['market']} | error: {market['play_error']} | 0 | 0 | | | | |")
+            continue
+        for r in market["category_rollups"]:
+            lines.append(
+                f"| {market['market']} | {r['category']} | {r['apps']} | {r['reviews']} | {r['low_star_pct']} | "
+                f"{r['paywall_pct']} | {r['bugs_pct']} | {r['bypass_pct']} |"
+            )
+    lines.append("")
+
+    lines.append("## App Presence Across Markets")
+    lines.append("")
+    lines.append("| App | Package | Category | Markets | Max installs | Reviews sampled |")
+    lines.append("|---|---|---|---|---:|---:|")
+    for app in rollup["apps"]:
+        lines.append(
+            f"| {app['title']} | `{app['package_name']}` | {app['category']} | {', '.join(app['markets'])} | "
+            f"{app['max_installs_count']} | {app['reviews_sampled']} |"
+        )
+    lines.append("")
+
+    output_path.write_text("\n".join(lines), encoding="utf-8")
+
+
+def render_main(argv: list[str]) -> int:
+    """``market_scan.py render``: rebuild markdown outputs from a saved JSON payload, offline."""
+    parser = argparse.ArgumentParser(
+        prog="market_scan.py render",
+        description="Rebuild the markdown reports from market_scan_latest.json or market_scan_markets.json.",
+    )
+    parser.add_argument("--from", dest="source", required=True, help="Saved JSON payload to render")
+    parser.add_argument("--out-dir", default="", help="Output directory (default: the payload's directory)")
+    args = parser.parse_args(argv)
+
+    source = Path(args.source)
+    payload = json.loads(source.read_text(encoding="utf-8"), object_hook=_json_object_hook)
+    out_dir = Path(args.out_dir) if args.out_dir else source.resolve().parent
+    out_dir.mkdir(parents=True, exist_ok=True)
+    if "markets" in payload:
+        written = [out_dir / "market_scan_markets.md"]
+        emit_cross_market_markdown(written[0], payload["generated_at"], payload)
+    else:
+        written = write_market_markdown(out_dir, payload)
+    for path in written:
+        print(f"Wrote: {path}")
     return 0
 
 
+def main(argv: list[str] | None = None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    if argv[:1] == ["render"]:
+        return render_main(argv[1:])
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.batch_analysis and not args.incremental:
+        parser.error("--batch-analysis reads the review store and requires --incremental")
+    if args.batch_analysis:
+        # Fail before any network work rather than after the fetches.
+        try:
+            _numpy()
+        except RuntimeError as e:
+            parser.error(f"--batch-analysis: {e}")
+    if args.record_fixtures and args.replay_fixtures:
+        parser.error("--record-fixtures and --replay-fixtures are mutually exclusive")
+    markets = parse_markets(args.markets) if args.markets else [(args.country, args.lang)]
+    multi_market = bool(args.markets)
+
+    generated_at = now_iso()
+    out_dir = Path(args.out_dir).resolve()
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    # Market-independent work is done once: source probes run in the
+    # background, and the client (request budget, cache, profiler) and review
+    # store are shared by every market.
+    profiler = PipelineProfiler()
+    recorder = PlayFixtures(Path(args.record_fixtures)) if args.record_fixtures else None
+    replay = None
+    prober = None
+    if args.replay_fixtures:
+        replay = ReplayBackend(
+            PlayFixtures(Path(args.replay_fixtures)),
+            latency_s=args.replay_latency_ms / 1000.0,
+            error_rate=args.replay_error_rate,
+        )
+    else:
+        prober = SourceProber(SOURCE_URLS, budget_s=args.probe_budget, profiler=profiler).start()
+
+    runs = [
+        MarketRun.open(
+            country,
+            lang,
+            out_dir / "markets" / f"{country}_{lang}" if multi_market else out_dir,
+            generated_at,
+            args,
+        )
+        for country, lang in markets
+    ]
+
+    try:
+        if replay is None and not load_play_scraper():
+            for run in runs:
+                run.play_error = SCRAPER_MISSING_ERROR
+        else:
+            cache = None
+            # Recording must see every live response, and a replay must depend on
+            # the archive alone and must not leak fixture data into the cache.
+            if not args.no_cache and not args.record_fixtures and not args.replay_fixtures:
+                cache = ScraperCache(
+                    Path(args.cache_dir),
+                    ttl_s=parse_cache_ttls(args.cache_ttl),
+                    max_bytes=args.cache_max_mb * 1024 * 1024,
+                    refresh=args.refresh,
+                )
+            gate = RequestGate(
+                max_in_flight=args.max_in_flight if args.max_in_flight > 0 else max(1, args.workers),
+                rate_per_host=args.rate_limit,
+                burst=args.rate_burst,
+            )
+            # Timed Play calls of every market share one thread per gate slot.
+            call_pool = ThreadPoolExecutor(max_workers=gate.max_in_flight, thread_name_prefix="gp-call")
+            review_store = ReviewStore(Path(args.review_store)) if args.incremental else None
+            analysis_pool = AnalysisPool(args.analysis_workers) if args.analysis_workers > 1 else None
+            history = SignalHistory(Path(args.history_db)) if not args.no_history else None
+            seen = SeenReviews(Path(args.seen_reviews)) if not args.no_history else None
+
+            def run_one(run: MarketRun) -> None:
+                client = PlayClient(
+                    gate=gate,
+                    timeout_s=args.request_timeout,
+                    cache=cache,
+                    profiler=run.profiler,
+                    max_retries=args.max_retries,
+                    recorder=recorder,
+                    replay=replay,
+                    executor=call_pool,
+                )
+                try:
+                    run_market_pipeline(run, args, client, review_store, analysis_pool, history, seen)
+                except Exception as e:
+                    if not multi_market:
+                        raise
+                    run.play_error = f"{type(e).__name__}: {e}"
+                    print(f"Market {run.label} failed: {run.play_error}", file=sys.stderr)
+
+            # Bounds each read of an abandoned call too, so it ends (and frees
+            # its gate slot and thread) soon after call_with_timeout gives up.
+            with socket_default_timeout(args.request_timeout):
+                if len(runs) == 1:
+                    run_one(runs[0])
+                else:
+                    with ThreadPoolExecutor(max_workers=len(runs), thread_name_prefix="market") as pool:
+                        list(pool.map(run_one, runs))
+            call_pool.shutdown(wait=False)
+
+            gate_stats = gate.stats()
+            print(
+                f"Play throttling: {gate_stats['throttled_responses']} throttled responses, "
+                f"{gate_stats['breaker_trips']} circuit-breaker trips, "
+                f"concurrency limit {gate_stats['limit']}/{gate_stats['max_in_flight']} at end"
+            )
+            if analysis_pool is not None:
+                analysis_pool.close()
+            if review_store is not None:
+                review_store.close()
+            if history is not None:
+                history.close()
+            if seen is not None:
+                seen.save()
+                print(f"Seen reviews: {len(seen)} fingerprints ({seen.path})")
+            if cache is not None:
+                print(f"Cache: {cache.hits} hits, {cache.misses} misses ({cache.path})")
+                cache.close()
+
+        with profiler.stage("sources"):
+            if prober is not None:
+                source_status = prober.results()
+            else:
+                recorded = replay.fixtures.get("sources", []) if replay is not None else None
+                source_status = recorded["value"] if recorded and "value" in recorded else []
+        if recorder is not None:
+            recorder.put("sources", [], source_status)
+            recorder.save()
+            print(f"Recorded {len(recorder.entries)} fixtures: {recorder.path}")
+
+        written: list[Path] = []
+        for run in runs:
+            written.extend(emit_market_reports(run, args, source_status))
+            profiler.absorb(run.profiler, prefix=f"{run.label}/" if multi_market else "")
+
+        if multi_market:
+            rollup = cross_market_rollup(runs)
+            cross_md = out_dir / "market_scan_markets.md"
+            cross_json = out_dir / "market_scan_markets.json"
+            emit_cross_market_markdown(cross_md, generated_at, rollup)
+            rollup["generated_at"] = generated_at
+            rollup["sources"] = source_status
+            rollup["profile"] = profiler.summary()
+            write_json(cross_json, rollup, compact=args.compact)
+            written.extend([cross_md, cross_json])
+
+        print()
+        print(profiler.format_table())
+        print()
+        if args.trace_out:
+            profiler.write_trace(Path(args.trace_out))
+            print(f"Wrote: {args.trace_out}")
+        for path in written:
+            print(f"Wrote: {path}")
+        return 0
+    finally:
+        # A failed run must not leave its half-written .jsonl.tmp behind.
+        for run in runs:
+            run.stream.abort()
+
+
 if __name__ == "__main__":
     raise SystemExit(main())
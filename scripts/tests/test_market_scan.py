@@ -0,0 +1,407 @@
+"""
+Unit tests for scripts/market_scan.py.
+
+Everything runs against in-process fakes (a stand-in ``gp_app``, the
+benchmark's ``SyntheticPlay`` or a ``ReplayBackend`` over in-memory
+fixtures), so no network access or google_play_scraper install is needed.
+
+Usage:
+- python3 -m unittest discover -s scripts/tests
+"""
+
+from __future__ import annotations
+
+import random
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import bench_market_scan  # noqa: E402
+import market_scan  # noqa: E402
+
+
+def make_candidates(count: int) -> dict[str, market_scan.Candidate]:
+    return {f"com.test.app{i}": market_scan.Candidate(f"com.test.app{i}", search_installs=i * 1000) for i in range(count)}
+
+
+class FakeGpApp:
+    """``gp_app`` stand-in with per-app latency, failures and hangs."""
+
+    def __init__(self, seed: int = 7, failing: set[str] = frozenset(), hanging: set[str] = frozenset()) -> None:
+        self.rng = random.Random(seed)
+        self.latency: dict[str, float] = {}
+        self.failing = failing
+        self.hanging = hanging
+        self.hang_s = 0.5
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.peak_in_flight = 0
+
+    def __call__(self, app_id: str, lang: str = "en", country: str = "us") -> dict[str, Any]:
+        with self.lock:
+            delay = self.latency.setdefault(app_id, self.rng.uniform(0.0, 0.02))
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            time.sleep(self.hang_s if app_id in self.hanging else delay)
+            if app_id in self.failing:
+                raise ValueError(f"no such app {app_id}")
+            return {
+                "title": f"Porn Blocker {app_id}",
+                "developer": "dev",
+                "installs": "1,000,000+",
+                "score": 4.2,
+                "ratings": 1000,
+                "reviews": 10,
+                "genre": "Tools",
+                "summary": "quit porn addiction recovery",
+                "description": "block adult sites",
+            }
+        finally:
+            with self.lock:
+                self.in_flight -= 1
+
+
+class FetchMetadataTest(unittest.TestCase):
+    def fetch(
+        self, fake: FakeGpApp, workers: int, timeout_s: float | None = None
+    ) -> tuple[list[market_scan.AppRow], market_scan.RequestGate]:
+        gate = market_scan.RequestGate(max_in_flight=workers)
+        client = market_scan.PlayClient(gate=gate, timeout_s=timeout_s, max_retries=0)
+        with mock.patch.object(market_scan, "gp_app", fake):
+            rows = market_scan.fetch_metadata_for_candidates(make_candidates(24), "en", "us", workers=workers, client=client)
+        return rows, gate
+
+    def test_rows_keep_candidate_order_whatever_the_completion_order(self) -> None:
+        serial, _ = self.fetch(FakeGpApp(), workers=1)
+        concurrent, _ = self.fetch(FakeGpApp(), workers=6)
+        self.assertEqual([row.package_name for row in concurrent], list(make_candidates(24)))
+        self.assertEqual([row.to_json() for row in concurrent], [row.to_json() for row in serial])
+
+    def test_failed_candidate_becomes_an_error_row(self) -> None:
+        rows, _ = self.fetch(FakeGpApp(failing={"com.test.app5"}), workers=4)
+        failed = rows[5].to_json()
+        self.assertEqual(failed["status"], "error")
+        self.assertEqual(failed["error"], "ValueError: no such app com.test.app5")
+        self.assertNotIn("title", failed)
+        self.assertTrue(all(row.status == "ok" for i, row in enumerate(rows) if i != 5))
+
+    def test_timed_out_call_errors_and_keeps_its_gate_slot_until_it_ends(self) -> None:
+        fake = FakeGpApp(hanging={"com.test.app3"})
+        started = time.monotonic()
+        rows, gate = self.fetch(fake, workers=3, timeout_s=0.1)
+        self.assertLess(time.monotonic() - started, fake.hang_s)
+        self.assertEqual(rows[3].status, "error")
+        self.assertEqual(rows[3].error, "TimeoutError: no response after 0.1s")
+        self.assertLessEqual(fake.peak_in_flight, 3)
+        # The abandoned call still holds its slot, and frees it once it ends.
+        self.assertEqual(gate._in_flight, 1)
+        deadline = time.monotonic() + 2.0
+        while gate._in_flight and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(gate._in_flight, 0)
+
+
+def settle(gate: market_scan.RequestGate, error: BaseException | None = None) -> float:
+    """One request through ``gate`` that ends with ``error`` (None = success)."""
+    waited, release = gate.acquire()
+    release(error)
+    return waited
+
+
+def throttled() -> Exception:
+    return market_scan._replayed_error("ExtraHTTPError", "App not found. Status code 429 returned.")
+
+
+class RequestGateTest(unittest.TestCase):
+    def test_throttle_halves_the_limit_once_per_generation(self) -> None:
+        gate = market_scan.RequestGate(max_in_flight=8)
+        early = [gate.acquire() for _ in range(3)]
+        early[0][1](throttled())
+        self.assertEqual(gate.limit, 4)
+        # The others started before the cut, so their throttles do not cut again.
+        early[1][1](throttled())
+        early[2][1](None)
+        self.assertEqual(gate.limit, 4)
+        settle(gate, throttled())
+        self.assertEqual(gate.limit, 2)
+        self.assertEqual(gate.stats()["throttled_responses"], 3)
+
+    def test_successes_raise_the_limit_back_to_the_cap(self) -> None:
+        gate = market_scan.RequestGate(max_in_flight=4)
+        settle(gate, throttled())
+        settle(gate, throttled())
+        self.assertEqual(gate.limit, 1)
+        settle(gate)
+        self.assertEqual(gate.limit, 2)
+        for _ in range(2):
+            settle(gate)
+        self.assertEqual(gate.limit, 3)
+        for _ in range(10):
+            settle(gate)
+        self.assertEqual(gate.limit, 4)
+
+    def test_other_errors_leave_the_limit_alone(self) -> None:
+        gate = market_scan.RequestGate(max_in_flight=4)
+        settle(gate, ValueError("no such app"))
+        settle(gate, TimeoutError("no response after 1s"))
+        self.assertEqual(gate.limit, 4)
+        self.assertEqual(gate.stats()["throttled_responses"], 0)
+
+    def test_breaker_opens_then_lets_one_trial_through(self) -> None:
+        gate = market_scan.RequestGate(breaker_threshold=3, breaker_cooldown_s=0.05, breaker_max_cooldown_s=0.08)
+        breaker = lambda: gate._breakers[market_scan.PLAY_HOST]  # noqa: E731
+        for _ in range(2):
+            self.assertEqual(settle(gate, TimeoutError("no response after 1s")), 0.0)
+        self.assertFalse(breaker().open_until)
+        settle(gate, TimeoutError("no response after 1s"))
+        self.assertEqual(gate.breaker_trips, 1)
+        self.assertTrue(breaker().open_until)
+
+        # The trial waits out the cooldown; its failure doubles it, capped.
+        self.assertGreater(settle(gate, throttled()), 0.0)
+        self.assertAlmostEqual(breaker().cooldown_s, 0.08)
+        self.assertEqual(gate.breaker_trips, 1)
+
+        # A successful trial closes the circuit.
+        self.assertGreater(settle(gate), 0.0)
+        self.assertFalse(breaker().open_until)
+        self.assertEqual(breaker().failures, 0)
+        self.assertEqual(settle(gate), 0.0)
+
+    def test_any_answer_resets_the_failure_count(self) -> None:
+        gate = market_scan.RequestGate(breaker_threshold=3)
+        for _ in range(2):
+            settle(gate, TimeoutError("no response after 1s"))
+        settle(gate, ValueError("no such app"))
+        for _ in range(2):
+            settle(gate, TimeoutError("no response after 1s"))
+        self.assertEqual(gate.breaker_trips, 0)
+
+
+class ScraperCacheTest(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.now = 1_000_000.0
+        clock = mock.patch.object(market_scan.time, "time", lambda: self.now)
+        clock.start()
+        self.addCleanup(clock.stop)
+        self.cache = market_scan.ScraperCache(Path(tmp.name), ttl_s={"app": 60.0, "search": 10.0})
+        self.addCleanup(self.cache.close)
+
+    def test_entries_expire_per_call_type(self) -> None:
+        self.cache.put("app", ["com.a", "en", "us"], {"title": "A"})
+        self.cache.put("search", ["blocker", "en", "us", 12], [{"appId": "com.a"}])
+        self.now += 30
+        self.assertEqual(self.cache.get("app", ["com.a", "en", "us"]), (True, {"title": "A"}))
+        self.assertEqual(self.cache.get("search", ["blocker", "en", "us", 12]), (False, None))
+        self.now += 31
+        self.assertEqual(self.cache.get("app", ["com.a", "en", "us"]), (False, None))
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 2))
+        self.assertEqual(self.cache._total_bytes, 0)
+
+    def test_evicts_least_recently_read_entries_first(self) -> None:
+        value = {"description": " ".join(str(random.Random(1).random()) for _ in range(50))}
+        for name in ("a", "b", "c"):
+            self.cache.put("app", [name], value)
+            self.now += 1
+        self.cache.get("app", ["a"])
+        self.now += 1
+        # Room for three entries: the fourth evicts down to 90%, oldest reads first.
+        self.cache.max_bytes = self.cache._total_bytes
+        self.cache.put("app", ["d"], value)
+        self.assertTrue(self.cache.get("app", ["a"])[0])
+        self.assertTrue(self.cache.get("app", ["d"])[0])
+        self.assertFalse(self.cache.get("app", ["b"])[0])
+        self.assertFalse(self.cache.get("app", ["c"])[0])
+        self.assertLessEqual(self.cache._total_bytes, self.cache.max_bytes)
+
+    def test_refresh_misses_but_still_writes(self) -> None:
+        self.cache.refresh = True
+        self.cache.put("app", ["com.a"], {"title": "A"})
+        self.assertEqual(self.cache.get("app", ["com.a"]), (False, None))
+        self.cache.refresh = False
+        self.assertEqual(self.cache.get("app", ["com.a"]), (True, {"title": "A"}))
+
+
+REVIEWS_AT = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def review(review_id: str, minutes_ago: int) -> dict[str, Any]:
+    return {
+        "reviewId": review_id,
+        "userName": f"user-{review_id}",
+        "content": f"review {review_id}",
+        "score": 3,
+        "at": REVIEWS_AT - timedelta(minutes=minutes_ago),
+    }
+
+
+class SyncReviewsTest(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.dir = Path(tmp.name)
+        self.store = market_scan.ReviewStore(self.dir / "reviews.sqlite3")
+        self.addCleanup(self.store.close)
+
+    def replay_pages(self, pages: list[tuple[int, list[dict[str, Any]]]]) -> market_scan.PlayClient:
+        """A client that serves ``(count, batch)`` pages, in order, from recorded fixtures.
+
+        Fixtures are keyed by the requested page size, so a sync that asks
+        for any other size fails with ``LookupError``.
+        """
+        fixtures = market_scan.PlayFixtures(self.dir / "fixtures.jsonl.gz")
+        token = None
+        for i, (count, batch) in enumerate(pages):
+            next_token = str(i + 1) if i + 1 < len(pages) else None
+            fixtures.put("reviews", ["com.test", "en", "us", count, token], {"batch": batch, "token": {"token": next_token}})
+            token = next_token
+        return market_scan.PlayClient(replay=market_scan.ReplayBackend(fixtures), max_retries=0)
+
+    def sync(self, client: market_scan.PlayClient, max_new: int, stats: dict[str, int] | None = None) -> int:
+        return market_scan.sync_reviews("com.test", "en", "us", self.store, max_new, client=client, stats=stats)
+
+    def test_first_sync_stores_the_newest_reviews(self) -> None:
+        client = market_scan.PlayClient(replay=bench_market_scan.SyntheticPlay(apps=1, reviews_per_app=500), max_retries=0)
+        self.assertEqual(market_scan.sync_reviews("com.synth.app0", "en", "us", self.store, 300, client=client), 300)
+        stored = self.store.load("com.synth.app0", "en", "us")
+        self.assertEqual([r["reviewId"] for r in stored], [f"com.synth.app0-{i}" for i in range(300)])
+        # Nothing new since: the probe page meets a stored review at once.
+        self.assertEqual(market_scan.sync_reviews("com.synth.app0", "en", "us", self.store, 300, client=client), 0)
+
+    def test_probe_page_grows_while_every_review_is_new(self) -> None:
+        self.store.add("com.test", "en", "us", [review(f"old{i}", 100 + i) for i in range(5)])
+        fresh = [review(f"new{i}", 25 - i) for i in range(25)]
+        stats: dict[str, int] = {}
+        client = self.replay_pages([(20, fresh[:20]), (40, [fresh[19], *fresh[20:], review("old0", 100)])])
+        self.assertEqual(self.sync(client, 100, stats), 25)
+        self.assertEqual(stats["duplicates"], 1)
+        self.assertEqual(len(self.store.load("com.test", "en", "us")), 30)
+
+    def test_stops_at_the_watermark_without_a_known_id(self) -> None:
+        self.store.add("com.test", "en", "us", [review("old0", 10)])
+        client = self.replay_pages([(20, [review("new0", 1), review("new1", 5), review("gone", 20), review("older", 30)])])
+        self.assertEqual(self.sync(client, 100), 2)
+        self.assertEqual([r["reviewId"] for r in self.store.load("com.test", "en", "us")], ["new0", "new1", "old0"])
+
+    def test_max_new_caps_the_sync(self) -> None:
+        client = self.replay_pages([(7, [review(f"new{i}", i) for i in range(7)])])
+        self.assertEqual(self.sync(client, 7), 7)
+
+
+class RunCheckpointTest(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = Path(tmp.name) / "checkpoint"
+        self.settings = {"country": "us", "lang": "en", "apps": 22}
+
+    def interrupted_run(self) -> None:
+        checkpoint = market_scan.RunCheckpoint(self.path, self.settings, resume=False)
+        self.assertFalse(checkpoint.resumed)
+        checkpoint.save("candidates", [market_scan.Candidate("com.a", seed=True).to_json()])
+        checkpoint.save_reviews("com.a", {"reviews_sampled": 3, "fetched_at": REVIEWS_AT})
+
+    def test_resume_with_the_same_settings_loads_finished_stages(self) -> None:
+        self.interrupted_run()
+        checkpoint = market_scan.RunCheckpoint(self.path, dict(self.settings), resume=True)
+        self.assertTrue(checkpoint.resumed)
+        candidates = [market_scan.Candidate.from_json(c) for c in checkpoint.load("candidates")]
+        self.assertEqual(candidates, [market_scan.Candidate("com.a", seed=True)])
+        self.assertIsNone(checkpoint.load("meta_rows"))
+        self.assertEqual(checkpoint.load_reviews("com.a"), {"reviews_sampled": 3, "fetched_at": REVIEWS_AT})
+        self.assertIsNone(checkpoint.load_reviews("com.b"))
+
+    def test_other_settings_start_over(self) -> None:
+        self.interrupted_run()
+        with mock.patch("builtins.print"):
+            checkpoint = market_scan.RunCheckpoint(self.path, {**self.settings, "apps": 10}, resume=True)
+        self.assertFalse(checkpoint.resumed)
+        self.assertIsNone(checkpoint.load("candidates"))
+        self.assertIsNone(checkpoint.load_reviews("com.a"))
+
+    def test_without_resume_the_old_checkpoint_is_dropped(self) -> None:
+        self.interrupted_run()
+        checkpoint = market_scan.RunCheckpoint(self.path, self.settings, resume=False)
+        self.assertIsNone(checkpoint.load("candidates"))
+        checkpoint.finish()
+        self.assertFalse(self.path.exists())
+
+
+class PrefilterCandidatesTest(unittest.TestCase):
+    def test_drops_only_non_seeds_that_stay_below_min_installs(self) -> None:
+        candidates = {
+            "com.small": market_scan.Candidate("com.small", search_installs=10_000, title_hint="Small"),
+            "com.seed": market_scan.Candidate("com.seed", seed=True, search_installs=1_000),
+            "com.unknown": market_scan.Candidate("com.unknown"),
+            "com.near": market_scan.Candidate("com.near", search_installs=50_000),
+            "com.big": market_scan.Candidate("com.big", search_installs=1_000_000),
+        }
+        skipped: list[dict[str, Any]] = []
+        kept = market_scan.prefilter_candidates(candidates, 100_000, skipped)
+        # One bucket up from 50,000+ is 100,000+, which may still pass.
+        self.assertEqual(list(kept), ["com.seed", "com.unknown", "com.near", "com.big"])
+        self.assertEqual([s["package_name"] for s in skipped], ["com.small"])
+        self.assertEqual(skipped[0]["title_hint"], "Small")
+        self.assertIn("below --min-installs 100,000", skipped[0]["reason"])
+        self.assertEqual(market_scan.prefilter_candidates(candidates, 0), candidates)
+
+
+class ClassifyPlayErrorTest(unittest.TestCase):
+    def test_scraper_status_phrase(self) -> None:
+        extra_http_error = market_scan._replayed_error
+        self.assertEqual(
+            market_scan.classify_play_error(extra_http_error("ExtraHTTPError", "App not found. Status code 503 returned.")),
+            "throttle",
+        )
+        self.assertEqual(
+            market_scan.classify_play_error(extra_http_error("ExtraHTTPError", "App not found. Status code 502 returned.")),
+            "transient",
+        )
+        self.assertIsNone(
+            market_scan.classify_play_error(extra_http_error("ExtraHTTPError", "App not found. Status code 400 returned."))
+        )
+
+    def test_other_numbers_in_a_message_are_not_a_status(self) -> None:
+        self.assertIsNone(market_scan.classify_play_error(ValueError("expected 500 reviews, got 120")))
+        self.assertIsNone(market_scan.classify_play_error(KeyError("item 503")))
+
+    def test_http_code_attribute_and_network_errors(self) -> None:
+        error = Exception("Too Many Requests")
+        error.code = 429  # type: ignore[attr-defined]
+        self.assertEqual(market_scan.classify_play_error(error), "throttle")
+        self.assertEqual(market_scan.classify_play_error(TimeoutError("no response after 30s")), "transient")
+        self.assertEqual(market_scan.classify_play_error(Exception("PlayGatewayError")), "throttle")
+
+
+class ReviewSignalTallyTest(unittest.TestCase):
+    def test_pages_through_the_pool_match_one_pass_and_stay_bounded(self) -> None:
+        items = bench_market_scan.synthetic_reviews(3000, seed=3)
+        expected = market_scan.analyze_review_signals(items)
+        pool = market_scan.AnalysisPool(2, min_shard=1000)
+        try:
+            tally = market_scan.ReviewSignalTally(pool)
+            peak_pending = 0
+            for start in range(0, len(items), 200):
+                tally.add(items[start : start + 200])
+                peak_pending = max(peak_pending, tally.sampled - tally.total)
+                self.assertEqual(tally.sampled, start + len(items[start : start + 200]))
+            self.assertLessEqual(peak_pending, 2 * 200)
+            self.assertEqual(tally.result(), expected)
+            self.assertEqual(market_scan.analyze_review_signals(items, pool=pool), expected)
+        finally:
+            pool.close()
+
+
+if __name__ == "__main__":
+    unittest.main()